@@ -0,0 +1 @@
+#keeps the repository root on sys.path so the tests import the curlmonkey package from the tree
@@ -2,21 +2,159 @@
 
 import logging
 import sys
+from functools import lru_cache
 from pathlib import Path
-from PySide6.QtWidgets import QApplication, QDockWidget
-from PySide6.QtCore import Qt
-from PySide6.QtGui import QIcon, QPalette, QColor
+from typing import TYPE_CHECKING
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
 
 from .logging_config import setup_logging
-from .persistence import (
-    load_settings, save_settings, load_history, load_collections,
-    load_environments, save_environments
-)
-from .ui_main import MainWindow
-from .ui_history import HistoryWidget, CollectionsWidget
+
+if TYPE_CHECKING:
+    from .ui_main import MainWindow
 
 logger = logging.getLogger(__name__)
 
+#dark theme stylesheet, built once at import and handed to qt as-is
+
+_DARK_QSS = """
+QMainWindow {
+    background-color: #353535;
+}
+QMenuBar {
+    background-color: #353535;
+    color: #ffffff;
+    border-bottom: 1px solid #555555;
+}
+QMenuBar::item {
+    background-color: transparent;
+    color: #ffffff;
+    padding: 4px 8px;
+}
+QMenuBar::item:selected {
+    background-color: #454545;
+    color: #ffffff;
+}
+QMenuBar::item:pressed {
+    background-color: #2a82da;
+    color: #ffffff;
+}
+QMenu {
+    background-color: #353535;
+    color: #ffffff;
+    border: 1px solid #555555;
+}
+QMenu::item {
+    background-color: transparent;
+    color: #ffffff;
+    padding: 4px 24px 4px 8px;
+}
+QMenu::item:selected {
+    background-color: #2a82da;
+    color: #ffffff;
+}
+QMenu::item:disabled {
+    color: #888888;
+}
+QMenu::separator {
+    height: 1px;
+    background-color: #555555;
+    margin: 4px 0px;
+}
+QTabWidget::pane {
+    border: 1px solid #555555;
+    background-color: #353535;
+}
+QTabBar::tab {
+    background-color: #454545;
+    color: #ffffff;
+    padding: 8px 16px;
+    border: 1px solid #555555;
+}
+QTabBar::tab:selected {
+    background-color: #2a82da;
+}
+QTableView {
+    background-color: #232323;
+    color: #ffffff;
+    gridline-color: #666666;
+    border: 2px solid #555555;
+    alternate-background-color: #2a2a2a;
+}
+QTableView::item {
+    border-right: 1px solid #666666;
+    border-bottom: 1px solid #666666;
+    padding: 6px;
+}
+QHeaderView::section {
+    background-color: #3a3a3a;
+    color: #ffffff;
+    padding: 8px;
+    border: 1px solid #666666;
+    border-right: 2px solid #888888;
+    border-bottom: 2px solid #888888;
+    font-weight: bold;
+}
+QHeaderView::section:first {
+    border-right: 3px solid #555555;
+}
+QLineEdit, QPlainTextEdit, QTextEdit {
+    background-color: #232323;
+    color: #ffffff;
+    border: 1px solid #555555;
+    padding: 4px;
+}
+QComboBox {
+    background-color: #232323;
+    color: #ffffff;
+    border: 1px solid #555555;
+    padding: 4px;
+}
+QComboBox::drop-down {
+    border: none;
+}
+QComboBox QAbstractItemView {
+    background-color: #232323;
+    color: #ffffff;
+    selection-background-color: #2a82da;
+}
+QPushButton {
+    background-color: #454545;
+    color: #ffffff;
+    border: 1px solid #555555;
+    padding: 6px 12px;
+    border-radius: 3px;
+}
+QPushButton:hover {
+    background-color: #555555;
+}
+QPushButton:pressed {
+    background-color: #2a82da;
+}
+QStatusBar {
+    background-color: #232323;
+    color: #ffffff;
+}
+"""
+
+
+class SidebarLoadSignals(QObject):
+    
+    loaded = Signal(object, object)
+
+
+class SidebarLoader(QRunnable):
+    #reads history and collections off the gui thread once the window is up
+    
+    def __init__(self):
+        super().__init__()
+        self.signals = SidebarLoadSignals()
+    
+    def run(self):
+        from .persistence import load_all
+        loaded = load_all(("history", "collections"))
+        self.signals.loaded.emit(loaded["history"], loaded["collections"])
+
 
 def create_application() -> QApplication:
     #set windows app id for proper taskbar icon (must be done before creating QApplication)
@@ -34,6 +172,7 @@ def create_application() -> QApplication:
     
     #set application icon
     
+    from PySide6.QtGui import QIcon
     icon_path = Path(__file__).parent.parent / "favicon.png"
     if icon_path.exists():
         app.setWindowIcon(QIcon(str(icon_path)))
@@ -46,187 +185,81 @@ def create_application() -> QApplication:
     
     return app
 
-#apply dark theme
+#dark palette, built on first use and reused for every later setup_application call
 
-def setup_application(app: QApplication, settings):
-    #apply dark theme
+@lru_cache(maxsize=None)
+def _build_dark_palette():
+    from PySide6.QtGui import QPalette, QColor
+    
     palette = QPalette()
     
+    #colors used by more than one role, setColor copies them so one instance each is enough
+    
+    white = QColor(255, 255, 255)
+    dark = QColor(53, 53, 53)
+    accent = QColor(42, 130, 218)
+    
     #window colors
     
-    palette.setColor(QPalette.Window, QColor(53, 53, 53))
-    palette.setColor(QPalette.WindowText, QColor(255, 255, 255))
+    palette.setColor(QPalette.Window, dark)
+    palette.setColor(QPalette.WindowText, white)
     
     #base colors (for input fields)
     
     palette.setColor(QPalette.Base, QColor(35, 35, 35))
-    palette.setColor(QPalette.AlternateBase, QColor(53, 53, 53))
+    palette.setColor(QPalette.AlternateBase, dark)
     
     #text colors
     
-    palette.setColor(QPalette.Text, QColor(255, 255, 255))
+    palette.setColor(QPalette.Text, white)
     palette.setColor(QPalette.BrightText, QColor(255, 0, 0))
     
     #button colors
     
-    palette.setColor(QPalette.Button, QColor(53, 53, 53))
-    palette.setColor(QPalette.ButtonText, QColor(255, 255, 255))
+    palette.setColor(QPalette.Button, dark)
+    palette.setColor(QPalette.ButtonText, white)
     
     #highlight colors
     
-    palette.setColor(QPalette.Highlight, QColor(42, 130, 218))
-    palette.setColor(QPalette.HighlightedText, QColor(255, 255, 255))
+    palette.setColor(QPalette.Highlight, accent)
+    palette.setColor(QPalette.HighlightedText, white)
     
     #tooltip colors
     
     palette.setColor(QPalette.ToolTipBase, QColor(0, 0, 0))
-    palette.setColor(QPalette.ToolTipText, QColor(255, 255, 255))
+    palette.setColor(QPalette.ToolTipText, white)
     
     #link colors
     
-    palette.setColor(QPalette.Link, QColor(42, 130, 218))
+    palette.setColor(QPalette.Link, accent)
     palette.setColor(QPalette.LinkVisited, QColor(130, 42, 218))
     
-    #set palette for all color groups (active, inactive, disabled)
-    
-    for group in [QPalette.ColorGroup.Active, QPalette.ColorGroup.Inactive, QPalette.ColorGroup.Disabled]:
-        palette.setColor(group, QPalette.Window, QColor(53, 53, 53))
-        palette.setColor(group, QPalette.WindowText, QColor(255, 255, 255))
-        palette.setColor(group, QPalette.Button, QColor(53, 53, 53))
-        palette.setColor(group, QPalette.ButtonText, QColor(255, 255, 255))
-        palette.setColor(group, QPalette.Text, QColor(255, 255, 255))
+    #setColor without a group applies to active, inactive and disabled alike
     
-    app.setPalette(palette)
+    return palette
+
+
+#apply dark theme
+
+def setup_application(app: QApplication, settings):
+    app.setPalette(_build_dark_palette())
     
     #additional stylesheet for better dark theme
     
-    app.setStyleSheet("""
-        QMainWindow {
-            background-color: #353535;
-        }
-        QMenuBar {
-            background-color: #353535;
-            color: #ffffff;
-            border-bottom: 1px solid #555555;
-        }
-        QMenuBar::item {
-            background-color: transparent;
-            color: #ffffff;
-            padding: 4px 8px;
-        }
-        QMenuBar::item:selected {
-            background-color: #454545;
-            color: #ffffff;
-        }
-        QMenuBar::item:pressed {
-            background-color: #2a82da;
-            color: #ffffff;
-        }
-        QMenu {
-            background-color: #353535;
-            color: #ffffff;
-            border: 1px solid #555555;
-        }
-        QMenu::item {
-            background-color: transparent;
-            color: #ffffff;
-            padding: 4px 24px 4px 8px;
-        }
-        QMenu::item:selected {
-            background-color: #2a82da;
-            color: #ffffff;
-        }
-        QMenu::item:disabled {
-            color: #888888;
-        }
-        QMenu::separator {
-            height: 1px;
-            background-color: #555555;
-            margin: 4px 0px;
-        }
-        QTabWidget::pane {
-            border: 1px solid #555555;
-            background-color: #353535;
-        }
-        QTabBar::tab {
-            background-color: #454545;
-            color: #ffffff;
-            padding: 8px 16px;
-            border: 1px solid #555555;
-        }
-        QTabBar::tab:selected {
-            background-color: #2a82da;
-        }
-        QTableWidget {
-            background-color: #232323;
-            color: #ffffff;
-            gridline-color: #666666;
-            border: 2px solid #555555;
-            alternate-background-color: #2a2a2a;
-        }
-        QTableWidget::item {
-            border-right: 1px solid #666666;
-            border-bottom: 1px solid #666666;
-            padding: 6px;
-        }
-        QHeaderView::section {
-            background-color: #3a3a3a;
-            color: #ffffff;
-            padding: 8px;
-            border: 1px solid #666666;
-            border-right: 2px solid #888888;
-            border-bottom: 2px solid #888888;
-            font-weight: bold;
-        }
-        QHeaderView::section:first {
-            border-right: 3px solid #555555;
-        }
-        QLineEdit, QPlainTextEdit, QTextEdit {
-            background-color: #232323;
-            color: #ffffff;
-            border: 1px solid #555555;
-            padding: 4px;
-        }
-        QComboBox {
-            background-color: #232323;
-            color: #ffffff;
-            border: 1px solid #555555;
-            padding: 4px;
-        }
-        QComboBox::drop-down {
-            border: none;
-        }
-        QComboBox QAbstractItemView {
-            background-color: #232323;
-            color: #ffffff;
-            selection-background-color: #2a82da;
-        }
-        QPushButton {
-            background-color: #454545;
-            color: #ffffff;
-            border: 1px solid #555555;
-            padding: 6px 12px;
-            border-radius: 3px;
-        }
-        QPushButton:hover {
-            background-color: #555555;
-        }
-        QPushButton:pressed {
-            background-color: #2a82da;
-        }
-        QStatusBar {
-            background-color: #232323;
-            color: #ffffff;
-        }
-    """)
+    app.setStyleSheet(_DARK_QSS)
 
 
-def create_main_window(app: QApplication) -> MainWindow:
-    #load data
-    settings = load_settings()
-    environments = load_environments()
-    history_entries = load_history()
-    collections = load_collections()
+def create_main_window(app: QApplication) -> "MainWindow":
+    from PySide6.QtWidgets import QDockWidget
+    from PySide6.QtCore import Qt
+    from .persistence import load_all, save_environments
+    from .ui_main import MainWindow
+    from .ui_history import HistoryWidget, CollectionsWidget
+    
+    #load data needed for the first frame, history and collections follow in load_sidebar_data
+    loaded = load_all(("settings", "environments"))
+    settings = loaded["settings"]
+    environments = loaded["environments"]
     
     #ensure default environment exists
     
@@ -239,10 +272,7 @@ def create_main_window(app: QApplication) -> MainWindow:
     #create widgets
     
     history_widget = HistoryWidget()
-    history_widget.load_history(history_entries)
-    
     collections_widget = CollectionsWidget()
-    collections_widget.load_collections(collections)
     
     #create main window
     
@@ -274,6 +304,12 @@ def create_main_window(app: QApplication) -> MainWindow:
     return main_window
 
 
+def load_sidebar_data(main_window: "MainWindow"):
+    loader = SidebarLoader()
+    loader.signals.loaded.connect(main_window.on_sidebar_data_loaded)
+    QThreadPool.globalInstance().start(loader)
+
+
 def run_application():
     #setup logging
     setup_logging()
@@ -287,24 +323,44 @@ def run_application():
     main_window = create_main_window(app)
     main_window.show()
     
+    #populate history and collections after the first paint
+    
+    QTimer.singleShot(0, lambda: load_sidebar_data(main_window))
+    
     #run event loop
     
     exit_code = app.exec()
     
     #save data on exit
     
-    logger.info("Saving data on exit...")
+    from concurrent.futures import ThreadPoolExecutor
     from .persistence import save_history, save_collections, save_environments
     
-    history_widget = main_window.history_widget
-    collections_widget = main_window.collections_widget
+    main_window.flush_pending_saves()
+    main_window.http_sessions.close()
+    main_window.discard_response_file()
+    environments = main_window.environments
+    saves = [(save_environments, environments)]
     
-    save_history(history_widget.get_all_entries())
-    save_collections(collections_widget.get_all_collections())
+    #never overwrite the files with the empty placeholders if loading did not finish
     
-    #save environments
-    environments = main_window.environments
-    save_environments(environments)
+    if main_window.sidebar_loaded:
+        history = main_window.history_widget.get_all_entries()
+        collections = main_window.collections_widget.get_all_collections()
+        saves += [(save_history, history), (save_collections, collections)]
+    else:
+        history = collections = None
+        logger.warning("History and collections were not loaded, skipping save")
+    
+    #the files are independent, write them side by side
+    
+    with ThreadPoolExecutor(max_workers=len(saves)) as pool:
+        list(pool.map(lambda save: save[0](save[1]), saves))
+    
+    if history is not None:
+        logger.info(f"Saved on exit: history({len(history)}), collections({len(collections)}), environments({len(environments)})")
+    else:
+        logger.info(f"Saved on exit: environments({len(environments)})")
     
     logger.info("Application exiting")
     return exit_code
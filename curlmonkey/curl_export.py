@@ -1,12 +1,19 @@
 #export request model to cURL
 
-import shlex
+import re
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 from .models import RequestModel
 
+#same safe set shlex.quote uses, strings made only of these need no quoting
+
+_SAFE_RE = re.compile(r'\A[A-Za-z0-9_@%+=:,./-]+\Z')
+
 
 def escape_shell_string(s: str) -> str:
+    if _SAFE_RE.match(s):
+        return s
     #proper escaping
+    import shlex
     return shlex.quote(s)
 
 
@@ -22,29 +29,37 @@ def generate_curl_command(request: RequestModel, include_proxy: bool = False, pr
         ssl_verify: Whether to verify SSL certificates (default True)
     """
     parts = ["curl"]
+    method = request.method.value
+    auth_type = request.auth.auth_type.value
+    body_type = request.body_type.value
     
     #method
     
-    if request.method.value != "GET":
-        parts.append(f"-X {request.method.value}")
+    if method != "GET":
+        parts.append(f"-X {method}")
     
     #url with query params
     
     url = request.url
-    parsed = urlparse(url)
-    existing_params = parse_qs(parsed.query, keep_blank_values=True)
-    
-    #add enabled query params
-    
-    for param in request.query_params:
-        if param.enabled and param.key:
+    parsed = None
+    enabled_params = [param for param in request.query_params if param.enabled and param.key]
+    if enabled_params:
+        parsed = urlparse(url)
+        existing_params = parse_qs(parsed.query, keep_blank_values=True)
+        
+        #add enabled query params
+        
+        for param in enabled_params:
             existing_params[param.key] = [param.value]
-    
-    #rebuild url
-    
-    new_query = urlencode(existing_params, doseq=True)
-    new_parsed = parsed._replace(query=new_query)
-    full_url = urlunparse(new_parsed)
+        
+        #rebuild url
+        
+        new_query = urlencode(existing_params, doseq=True)
+        new_parsed = parsed._replace(query=new_query)
+        full_url = urlunparse(new_parsed)
+    else:
+        #nothing to merge, use the url as typed
+        full_url = url
     
     parts.append(escape_shell_string(full_url))
     
@@ -56,20 +71,20 @@ def generate_curl_command(request: RequestModel, include_proxy: bool = False, pr
     
     #auth
     
-    if request.auth.auth_type.value == "basic":
+    if auth_type == "basic":
         if request.auth.username or request.auth.password:
             auth_str = f"{request.auth.username}:{request.auth.password}"
             parts.append(f"-u {escape_shell_string(auth_str)}")
-    elif request.auth.auth_type.value == "bearer":
+    elif auth_type == "bearer":
         if request.auth.bearer_token:
             parts.append(f"-H {escape_shell_string(f'Authorization: Bearer {request.auth.bearer_token}')}")
     
     #body
     
-    if request.body_type.value == "raw":
+    if body_type == "raw":
         if request.raw_body:
             parts.append(f"--data-raw {escape_shell_string(request.raw_body)}")
-    elif request.body_type.value == "x-www-form-urlencoded":
+    elif body_type == "x-www-form-urlencoded":
         if request.form_data:
             form_parts = []
             for item in request.form_data:
@@ -78,7 +93,7 @@ def generate_curl_command(request: RequestModel, include_proxy: bool = False, pr
             if form_parts:
                 form_str = "&".join(form_parts)
                 parts.append(f"--data {escape_shell_string(form_str)}")
-    elif request.body_type.value == "multipart/form-data":
+    elif body_type == "multipart/form-data":
         for item in request.multipart_data:
             if item.enabled and item.key:
                 if item.type == "file":
@@ -89,10 +104,11 @@ def generate_curl_command(request: RequestModel, include_proxy: bool = False, pr
     #proxy
     
     if include_proxy:
-        parsed_url = urlparse(full_url)
-        if parsed_url.scheme == "https" and proxy_https:
+        #scheme survives the query rewrite, so reuse the earlier parse if there was one
+        scheme = (parsed if parsed is not None else urlparse(url)).scheme
+        if scheme == "https" and proxy_https:
             parts.append(f"--proxy {escape_shell_string(proxy_https)}")
-        elif parsed_url.scheme == "http" and proxy_http:
+        elif scheme == "http" and proxy_http:
             parts.append(f"--proxy {escape_shell_string(proxy_http)}")
     
     #ssl verify (default is on, so we only add if disabled)
@@ -1,10 +1,85 @@
 #import cURL command into request model
 
 import re
-import shlex
+from dataclasses import dataclass, field
+from typing import List, Optional, Tuple
 from urllib.parse import urlparse, parse_qs, urlencode, urlunparse
 from .models import RequestModel, HttpMethod, BodyType, RawBodyType, AuthType, AuthConfig, KeyValuePair, MultipartItem
 
+_HTTP_METHOD_MAP = HttpMethod._value2member_map_
+
+_HEADER_RE = re.compile(r'\s*([^:]*?)\s*:\s*(.*?)\s*\Z', re.DOTALL)
+
+
+@dataclass
+class _ParseState:
+    method: str = "GET"
+    headers: List[Tuple[str, str]] = field(default_factory=list)
+    data: Optional[str] = None
+    data_raw: Optional[str] = None
+    data_binary: Optional[str] = None
+    form_data: List[str] = field(default_factory=list)
+    auth_user: Optional[str] = None
+    auth_pass: Optional[str] = None
+    bearer_token: Optional[str] = None
+
+
+def _set_method(state: _ParseState, value: str) -> None:
+    state.method = value.upper()
+
+
+def _add_header(state: _ParseState, value: str) -> None:
+    match = _HEADER_RE.match(value)
+    if not match:
+        return
+    key, header_value = match.groups()
+    #check for authorization bearer
+    if key.lower() == "authorization" and header_value[:7].lower() == "bearer ":
+        state.bearer_token = header_value[7:].strip()
+    else:
+        state.headers.append((key, header_value))
+
+
+def _set_data(state: _ParseState, value: str) -> None:
+    state.data = value
+
+
+def _set_data_raw(state: _ParseState, value: str) -> None:
+    state.data_raw = value
+
+
+def _set_data_binary(state: _ParseState, value: str) -> None:
+    state.data_binary = value
+
+
+def _add_form(state: _ParseState, value: str) -> None:
+    state.form_data.append(value)
+
+
+def _set_user(state: _ParseState, value: str) -> None:
+    if ":" in value:
+        state.auth_user, state.auth_pass = value.split(":", 1)
+    else:
+        state.auth_user = value
+
+
+#flag -> handler for every flag that consumes the following token
+
+_FLAG_SETTERS = {
+    "-X": _set_method,
+    "--request": _set_method,
+    "-H": _add_header,
+    "--header": _add_header,
+    "-d": _set_data,
+    "--data": _set_data,
+    "--data-raw": _set_data_raw,
+    "--data-binary": _set_data_binary,
+    "-F": _add_form,
+    "--form": _add_form,
+    "-u": _set_user,
+    "--user": _set_user,
+}
+
 
 def parse_curl_command(curl_string: str) -> RequestModel:
     """
@@ -12,6 +87,8 @@ def parse_curl_command(curl_string: str) -> RequestModel:
     
     raises ValueError if parsing fails
     """
+    import shlex
+    
     request = RequestModel()
     
     #remove 'curl' prefix if present
@@ -53,98 +130,56 @@ def parse_curl_command(curl_string: str) -> RequestModel:
     
     i = 0
     url = None
-    method = "GET"
-    headers = []
-    data = None
-    data_raw = None
-    data_binary = None
-    form_data = []
-    auth_user = None
-    auth_pass = None
-    bearer_token = None
+    state = _ParseState()
     
     while i < len(tokens):
         token = tokens[i]
         
-        if token == "-X" or token == "--request":
-            if i + 1 < len(tokens):
-                method = tokens[i + 1].upper()
-                i += 2
-                continue
-        elif token == "-H" or token == "--header":
-            if i + 1 < len(tokens):
-                header_str = tokens[i + 1]
-                if ":" in header_str:
-                    key, value = header_str.split(":", 1)
-                    key = key.strip()
-                    value = value.strip()
-                    #check for authorization bearer
-                    if key.lower() == "authorization" and value.lower().startswith("bearer "):
-                        bearer_token = value[7:].strip()
-                    else:
-                        headers.append((key, value))
-                i += 2
-                continue
-        elif token == "-d" or token == "--data":
-            if i + 1 < len(tokens):
-                data = tokens[i + 1]
-                i += 2
-                continue
-        elif token == "--data-raw":
-            if i + 1 < len(tokens):
-                data_raw = tokens[i + 1]
-                i += 2
-                continue
-        elif token == "--data-binary":
-            if i + 1 < len(tokens):
-                data_binary = tokens[i + 1]
-                i += 2
-                continue
-        elif token == "-F" or token == "--form":
-            if i + 1 < len(tokens):
-                form_data.append(tokens[i + 1])
-                i += 2
-                continue
-        elif token == "-u" or token == "--user":
+        #flags that take a value dispatch through a single table lookup
+        
+        setter = _FLAG_SETTERS.get(token)
+        if setter is not None:
             if i + 1 < len(tokens):
-                auth_str = tokens[i + 1]
-                if ":" in auth_str:
-                    auth_user, auth_pass = auth_str.split(":", 1)
-                else:
-                    auth_user = auth_str
+                setter(state, tokens[i + 1])
                 i += 2
-                continue
-        elif token.startswith("--proxy"):
+            else:
+                i += 1
+            continue
+        
+        if token.startswith("--proxy"):
             #skip proxy settings
             if i + 1 < len(tokens):
                 i += 2
             else:
                 i += 1
             continue
-        elif token.startswith("-") or token.startswith("--"):
-            #unknown flag, skip it and its value if it has one
+        elif token.startswith("-"):
+            #unknown flag, skip it
             i += 1
             continue
-        else:
-            #this might be the url
-            if not url and (token.startswith("http://") or token.startswith("https://")):
-                url = token
-            elif not url:
-                #try to treat as url anyway
-                url = token
+        elif not url:
+            #first bare token is the url
+            url = token
         
         i += 1
     
+    method = state.method
+    headers = state.headers
+    data = state.data
+    data_raw = state.data_raw
+    data_binary = state.data_binary
+    form_data = state.form_data
+    auth_user = state.auth_user
+    auth_pass = state.auth_pass
+    bearer_token = state.bearer_token
+    
     if not url:
         raise ValueError("No URL found in cURL command")
     
     #set url and method
     
     request.url = url
-    try:
-        request.method = HttpMethod(method)
-    except ValueError:
-        request.method = HttpMethod.GET
+    request.method = _HTTP_METHOD_MAP.get(method, HttpMethod.GET)
     
     #parse url to extract query params
     
@@ -1,23 +1,47 @@
 #HTTP client
 
+import io
+import json
 import logging
+import os
+import re
+import tempfile
+import threading
 import time
-from typing import Optional, Dict
+from typing import Optional, Dict, List, Tuple, Union
 from urllib.parse import urlencode, urlparse, urlunparse, parse_qs
-import requests
-from requests.auth import HTTPBasicAuth
 
 from .models import RequestModel, ResponseModel, Settings, Environment
 
 logger = logging.getLogger(__name__)
 
+#innermost {{name}} only, so {{{name}}} keeps its outer braces around the value
+
+_VAR_RE = re.compile(r"\{\{([^{}]+)\}\}")
+
+#one decoder instance for every raw json body
+
+_json_decode = json.JSONDecoder().decode
+
+#response bodies are read in chunks of this size and refused beyond the cap
+
+_READ_CHUNK_SIZE = 64 * 1024
+MAX_RESPONSE_BYTES = 256 * 1024 * 1024
+
+#bodies past SPILL_BYTES go to a temp file, only the first BODY_PREVIEW_BYTES stay in memory
+
+SPILL_BYTES = 16 * 1024 * 1024
+BODY_PREVIEW_BYTES = 64 * 1024
+
 
 def substitute_variables(text: str, env_vars: Dict[str, str]) -> str:
-    result = text
-    for var_name, var_value in env_vars.items():
-        placeholder = f"{{{{{var_name}}}}}"
-        result = result.replace(placeholder, var_value)
-    return result
+    #most fields have no placeholders at all, and with no environment nothing can match
+    if not env_vars or "{{" not in text:
+        return text
+    
+    #single pass, unknown variables are left untouched
+    lookup = env_vars.get
+    return _VAR_RE.sub(lambda match: lookup(match.group(1), match.group(0)), text)
 
 
 def build_url(request: RequestModel, env_vars: Dict[str, str]) -> str:
@@ -29,6 +53,12 @@ def build_url(request: RequestModel, env_vars: Dict[str, str]) -> str:
     if (url.startswith('"') and url.endswith('"')) or (url.startswith("'") and url.endswith("'")):
         url = url[1:-1]
     
+    #nothing to merge, send the url as typed instead of round-tripping it through urllib
+    
+    enabled_params = [param for param in request.query_params if param.enabled and param.key]
+    if not enabled_params:
+        return url
+    
     #parse existing url
     
     parsed = urlparse(url)
@@ -36,9 +66,8 @@ def build_url(request: RequestModel, env_vars: Dict[str, str]) -> str:
     
     #add enabled query params
     
-    for param in request.query_params:
-        if param.enabled and param.key:
-            existing_params[param.key] = [substitute_variables(param.value, env_vars)]
+    for param in enabled_params:
+        existing_params[param.key] = [substitute_variables(param.value, env_vars)]
     
     #rebuild url
     
@@ -60,23 +89,131 @@ def build_headers(request: RequestModel, env_vars: Dict[str, str]) -> Dict[str,
     
     #add auth headers
     
-    if request.auth.auth_type.value == "bearer" and request.auth.bearer_token:
+    auth_type = request.auth.auth_type.value
+    if auth_type == "bearer" and request.auth.bearer_token:
         token = substitute_variables(request.auth.bearer_token, env_vars)
         headers["Authorization"] = f"Bearer {token}"
     
     return headers
 
 
+class MultipartBody:
+    """
+    multipart/form-data body that streams file parts from disk.
+    
+    the full length is known up front so requests still sends a Content-Length,
+    but file contents are only read in small blocks while the body is sent.
+    """
+    
+    def __init__(self, fields: List[Tuple[str, str]], files: List[Tuple[str, str]]):
+        self.boundary = os.urandom(16).hex()
+        self.content_type = f"multipart/form-data; boundary={self.boundary}"
+        
+        #segments are either literal bytes or a path to stream from
+        
+        self._segments: List[Union[bytes, str]] = []
+        self._length = 0
+        for name, value in fields:
+            self._add(self._part_header(name) + value.encode("utf-8") + b"\r\n")
+        for name, path in files:
+            size = os.path.getsize(path)
+            filename = os.path.basename(path)
+            self._add(self._part_header(name, filename))
+            self._segments.append(path)
+            self._length += size
+            self._add(b"\r\n")
+        self._add(f"--{self.boundary}--\r\n".encode("ascii"))
+        
+        self._index = 0
+        self._offset = 0
+        self._position = 0
+        self._file = None
+    
+    def _add(self, segment: bytes):
+        self._segments.append(segment)
+        self._length += len(segment)
+    
+    def _part_header(self, name: str, filename: Optional[str] = None) -> bytes:
+        def quote(value: str) -> str:
+            return value.translate({10: "%0A", 13: "%0D", 34: "%22"})
+        
+        disposition = f'form-data; name="{quote(name)}"'
+        if filename is not None:
+            disposition += f'; filename="{quote(filename)}"'
+        return f"--{self.boundary}\r\nContent-Disposition: {disposition}\r\n\r\n".encode("utf-8")
+    
+    def __len__(self) -> int:
+        return self._length
+    
+    def __iter__(self):
+        while True:
+            chunk = self.read(64 * 1024)
+            if not chunk:
+                return
+            yield chunk
+    
+    def read(self, size: int = -1) -> bytes:
+        chunks = []
+        remaining = size if size is not None and size >= 0 else None
+        
+        while self._index < len(self._segments) and (remaining is None or remaining > 0):
+            segment = self._segments[self._index]
+            if isinstance(segment, bytes):
+                end = len(segment) if remaining is None else self._offset + remaining
+                data = segment[self._offset:end]
+                self._offset += len(data)
+                done = self._offset >= len(segment)
+            else:
+                if self._file is None:
+                    self._file = open(segment, "rb")
+                data = self._file.read(-1 if remaining is None else remaining)
+                done = remaining is None or len(data) < remaining
+                if done:
+                    self._file.close()
+                    self._file = None
+            
+            if done:
+                self._index += 1
+                self._offset = 0
+            if data:
+                chunks.append(data)
+                if remaining is not None:
+                    remaining -= len(data)
+        
+        result = b"".join(chunks)
+        self._position += len(result)
+        return result
+    
+    def tell(self) -> int:
+        return self._position
+    
+    def seek(self, offset: int, whence: int = io.SEEK_SET) -> int:
+        #only rewinding is supported (requests does this when following redirects)
+        if offset != 0 or whence != io.SEEK_SET:
+            raise io.UnsupportedOperation("MultipartBody can only be rewound")
+        self.close()
+        self._index = 0
+        self._offset = 0
+        self._position = 0
+        return 0
+    
+    def close(self):
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
 def build_body(request: RequestModel, env_vars: Dict[str, str]) -> Optional[tuple]:
-    if request.body_type.value == "none":
+    body_type = request.body_type.value
+    
+    if body_type == "none":
         return (None, None, None)
     
-    elif request.body_type.value == "raw":
+    elif body_type == "raw":
         body_text = substitute_variables(request.raw_body, env_vars)
         if request.raw_body_type.value == "json":
             try:
-                import json
-                json_data = json.loads(body_text)
+                json_data = _json_decode(body_text)
                 return (None, None, json_data)
             except json.JSONDecodeError:
                 #if invalid json, send as text
@@ -85,7 +222,7 @@ def build_body(request: RequestModel, env_vars: Dict[str, str]) -> Optional[tupl
         else:
             return (body_text, None, None)
     
-    elif request.body_type.value == "x-www-form-urlencoded":
+    elif body_type == "x-www-form-urlencoded":
         data = {}
         for item in request.form_data:
             if item.enabled and item.key:
@@ -94,30 +231,157 @@ def build_body(request: RequestModel, env_vars: Dict[str, str]) -> Optional[tupl
                 data[key] = value
         return (data, None, None)
     
-    elif request.body_type.value == "multipart/form-data":
-        data = {}
+    elif body_type == "multipart/form-data":
+        fields = {}
         files = {}
         for item in request.multipart_data:
             if item.enabled and item.key:
                 key = substitute_variables(item.key, env_vars)
                 if item.type == "file":
-                    try:
-                        file_path = substitute_variables(item.value, env_vars)
-                        files[key] = open(file_path, 'rb')
-                    except Exception as e:
-                        logger.warning(f"Could not open file {item.value}: {e}")
+                    file_path = substitute_variables(item.value, env_vars)
+                    if os.path.isfile(file_path):
+                        files[key] = file_path
+                    else:
+                        logger.warning(f"Could not open file {item.value}: not a file")
                 else:
                     value = substitute_variables(item.value, env_vars)
-                    data[key] = value
-        return (data, files, None)
+                    fields[key] = value
+        #nothing enabled means no body at all, not an empty multipart one
+        if not fields and not files:
+            return (None, None, None)
+        #file parts are streamed from disk instead of being read into memory
+        return (MultipartBody(list(fields.items()), list(files.items())), None, None)
     
     return (None, None, None)
 
+
+class SessionCache:
+    """
+    keep-alive requests session, built on first use and rebuilt when the network settings change.
+    
+    Building it is deferred to the first send, so owners can create one without importing requests.
+    """
+    
+    def __init__(self):
+        self.session = None
+        self.key = None
+        self.lock = threading.Lock()
+    
+    def get(self, settings: Settings):
+        import requests
+        from requests.adapters import HTTPAdapter
+        from http.cookiejar import DefaultCookiePolicy
+        
+        key = (settings.ssl_verify, settings.http_proxy, settings.https_proxy)
+        
+        with self.lock:
+            if self.session is None or self.key != key:
+                #a pooled worker may still be reading from the old session, so it is only
+                #dropped here and its connections go away once the last request using it ends
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=16, pool_maxsize=32, max_retries=0)
+                session.mount("http://", adapter)
+                session.mount("https://", adapter)
+                #only reuse connections, requests stay stateless so no cookies are carried over
+                session.cookies.set_policy(DefaultCookiePolicy(allowed_domains=[]))
+                
+                self.session = session
+                self.key = key
+            
+            return self.session
+    
+    def close(self):
+        with self.lock:
+            if self.session is not None:
+                self.session.close()
+                self.session = None
+                self.key = None
+
+
+#fallback for callers that do not bring their own cache
+
+_default_sessions = SessionCache()
+
+
+def get_session(settings: Settings):
+    return _default_sessions.get(settings)
+
 #send an HTTP request synchronously
 
-def send_request(request: RequestModel, settings: Settings, environments: Dict[str, Environment]) -> ResponseModel:
+class RequestCancelled(Exception):
+    pass
+
+
+def read_response_body(response, max_bytes: int = MAX_RESPONSE_BYTES,
+                       cancel_event: Optional[threading.Event] = None,
+                       spill_bytes: Optional[int] = SPILL_BYTES) -> Tuple[bytes, Optional[str]]:
+    """
+    read a streamed response body, returns (body, body_path).
+    
+    The buffer is preallocated from Content-Length when that is the decoded size,
+    otherwise it grows as chunks arrive. Once the body passes spill_bytes the rest
+    is written to a temp file whose path is returned, and the buffer is cut down to
+    a preview of the first BODY_PREVIEW_BYTES. The body is returned as bytes, copied
+    out of the buffer once. Raises ValueError past max_bytes and RequestCancelled
+    once cancel_event is set.
+    """
+    declared = 0
+    if "Content-Encoding" not in response.headers:
+        try:
+            declared = int(response.headers.get("Content-Length") or 0)
+        except ValueError:
+            declared = 0
+    if declared > max_bytes:
+        raise ValueError(f"Response body of {declared} bytes exceeds the {max_bytes} byte limit")
+    
+    spill = spill_bytes is not None and declared > spill_bytes
+    buffer = bytearray(0 if spill else declared)
+    offset = 0
+    spill_file = None
+    try:
+        for chunk in response.iter_content(_READ_CHUNK_SIZE):
+            if cancel_event is not None and cancel_event.is_set():
+                raise RequestCancelled()
+            end = offset + len(chunk)
+            if end > max_bytes:
+                raise ValueError(f"Response body exceeds the {max_bytes} byte limit")
+            if spill_file is None and spill_bytes is not None and end > spill_bytes:
+                spill_file = tempfile.NamedTemporaryFile(prefix="curlmonkey-", suffix=".body", delete=False)
+                del buffer[offset:]
+                spill_file.write(buffer)
+                del buffer[BODY_PREVIEW_BYTES:]
+            if spill_file is not None:
+                spill_file.write(chunk)
+                if len(buffer) < BODY_PREVIEW_BYTES:
+                    buffer += chunk[:BODY_PREVIEW_BYTES - len(buffer)]
+            else:
+                #fills the preallocated space in place, grows the buffer once past it
+                buffer[offset:end] = chunk
+            offset = end
+    except BaseException:
+        if spill_file is not None:
+            spill_file.close()
+            os.unlink(spill_file.name)
+        raise
+    
+    if spill_file is not None:
+        spill_file.close()
+        return bytes(buffer), spill_file.name
+    
+    #one copy into immutable bytes, cut to what arrived in case the server sent less than it announced
+    return bytes(memoryview(buffer)[:offset]), None
+
+
+def send_request(request: RequestModel, settings: Settings, environments: Dict[str, Environment],
+                 cancel_event: Optional[threading.Event] = None,
+                 sessions: Optional[SessionCache] = None) -> ResponseModel:
+    #requests is only needed once something is actually sent, keep it off the startup path
+    import requests
+    from requests.auth import HTTPBasicAuth
+    
     start_time = time.time()
     response_model = ResponseModel()
+    data = None
     
     try:
         #get environment variables
@@ -139,6 +403,8 @@ def send_request(request: RequestModel, settings: Settings, environments: Dict[s
         #build body
         
         data, files, json_data = build_body(request, env_vars)
+        if isinstance(data, MultipartBody) and not any(key.lower() == "content-type" for key in headers):
+            headers["Content-Type"] = data.content_type
         
         #prepare auth
         
@@ -165,8 +431,15 @@ def send_request(request: RequestModel, settings: Settings, environments: Dict[s
         
         #send request
         
+        #a request superseded while it was being prepared is never sent
+        if cancel_event is not None and cancel_event.is_set():
+            raise RequestCancelled()
+        
         logger.info(f"Sending {method} request to {url}")
-        response = requests.request(
+        session = (sessions or _default_sessions).get(settings)
+        #waiting for the status line and headers cannot be interrupted, cancel_event is
+        #checked again once they arrive and then between body chunks
+        response = session.request(
             method=method,
             url=url,
             headers=headers,
@@ -177,8 +450,16 @@ def send_request(request: RequestModel, settings: Settings, environments: Dict[s
             proxies=proxies,
             verify=settings.ssl_verify,
             timeout=settings.default_timeout,
-            allow_redirects=True
+            allow_redirects=True,
+            stream=True
         )
+        try:
+            if cancel_event is not None and cancel_event.is_set():
+                raise RequestCancelled()
+            body, body_path = read_response_body(response, cancel_event=cancel_event)
+        finally:
+            #an unfinished body cannot go back to the pool, closing drops just this connection
+            response.close()
         
         #calculate time taken
         
@@ -188,19 +469,31 @@ def send_request(request: RequestModel, settings: Settings, environments: Dict[s
         
         response_model.status_code = response.status_code
         response_model.reason = response.reason
-        response_model.headers = dict(response.headers)
-        response_model.body_bytes = response.content
+        #keep requests' case-insensitive mapping as is, no copy needed
+        response_model.headers = response.headers
+        response_model.body_bytes = body
+        if body_path is not None:
+            response_model.body_path = body_path
+            response_model.body_size = os.path.getsize(body_path)
         response_model.time_taken_ms = time_taken_ms
         
-        #try to decode text
+        #text is decoded lazily; prefer the declared charset and only sniff small bodies
         
-        try:
-            response_model.body_text = response.text
-        except:
-            response_model.body_text = response.content.decode('utf-8', errors='replace')
+        encoding = response.encoding
+        if not encoding and len(body) < 1024 * 1024:
+            #response.apparent_encoding would need response.content, which streaming has consumed
+            from requests.compat import chardet
+            if chardet is not None:
+                encoding = chardet.detect(body)["encoding"]
+        response_model.encoding = encoding or "utf-8"
         
         logger.info(f"Response: {response.status_code} ({time_taken_ms:.2f}ms)")
         
+    except RequestCancelled:
+        response_model.error = "Request cancelled"
+        response_model.time_taken_ms = (time.time() - start_time) * 1000
+        logger.info("Request cancelled")
+    
     except requests.exceptions.Timeout:
         response_model.error = f"Request timed out after {settings.default_timeout} seconds"
         response_model.time_taken_ms = (time.time() - start_time) * 1000
@@ -222,11 +515,9 @@ def send_request(request: RequestModel, settings: Settings, environments: Dict[s
         logger.error(f"Request error: {e}", exc_info=True)
     
     finally:
-        #close any open files
-        if files:
-            for file_obj in files.values():
-                if hasattr(file_obj, 'close'):
-                    file_obj.close()
+        #close any file still open by a multipart body
+        if isinstance(data, MultipartBody):
+            data.close()
     
     return response_model
 
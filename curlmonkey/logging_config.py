@@ -2,11 +2,13 @@
 
 import logging
 import sys
+from logging.handlers import MemoryHandler, RotatingFileHandler
 from pathlib import Path
-from .persistence import get_data_dir
 
 
 def setup_logging() -> None:
+    from .persistence import get_data_dir
+    
     log_dir = get_data_dir()
     log_file = log_dir / "curlmonkey.log"
     
@@ -17,12 +19,17 @@ def setup_logging() -> None:
         datefmt='%Y-%m-%d %H:%M:%S'
     )
     
-    #file handler
+    #file handler, size-capped and opened on first write
     
-    file_handler = logging.FileHandler(log_file, encoding='utf-8')
+    file_handler = RotatingFileHandler(log_file, maxBytes=5_000_000, backupCount=3, encoding='utf-8', delay=True)
     file_handler.setLevel(logging.DEBUG)
     file_handler.setFormatter(formatter)
     
+    #batch records in memory, errors are written through immediately
+    
+    buffered_handler = MemoryHandler(capacity=256, flushLevel=logging.ERROR, target=file_handler)
+    buffered_handler.setLevel(logging.DEBUG)
+    
     #console handler
     
     console_handler = logging.StreamHandler(sys.stdout)
@@ -33,7 +40,7 @@ def setup_logging() -> None:
     
     root_logger = logging.getLogger()
     root_logger.setLevel(logging.DEBUG)
-    root_logger.addHandler(file_handler)
+    root_logger.addHandler(buffered_handler)
     root_logger.addHandler(console_handler)
     
     #reduce noise from qt
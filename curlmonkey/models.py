@@ -1,9 +1,11 @@
 #data models
 
 from dataclasses import dataclass, field
-from typing import Dict, List, Optional, Any
+from typing import Dict, List, Mapping, Optional, Any
 from datetime import datetime
 from enum import Enum
+import sys
+from urllib.parse import urlparse
 
 
 class HttpMethod(str, Enum):
@@ -35,7 +37,15 @@ class AuthType(str, Enum):
     BEARER = "bearer"
 
 
-@dataclass
+#value -> member maps, a plain dict lookup instead of going through EnumMeta.__call__
+
+_METHOD_MAP = HttpMethod._value2member_map_
+_BODY_TYPE_MAP = BodyType._value2member_map_
+_RAW_BODY_TYPE_MAP = RawBodyType._value2member_map_
+_AUTH_TYPE_MAP = AuthType._value2member_map_
+
+
+@dataclass(slots=True)
 class KeyValuePair:
     enabled: bool = True
     key: str = ""
@@ -50,14 +60,18 @@ class KeyValuePair:
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "KeyValuePair":
+        #the same few header and param names repeat across every saved request, share one copy of each
+        key = data.get("key", "")
+        if isinstance(key, str):
+            key = sys.intern(key)
         return cls(
             enabled=data.get("enabled", True),
-            key=data.get("key", ""),
+            key=key,
             value=data.get("value", "")
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class MultipartItem:
     enabled: bool = True
     key: str = ""
@@ -82,7 +96,7 @@ class MultipartItem:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class AuthConfig:
     auth_type: AuthType = AuthType.NONE
     username: str = ""
@@ -100,14 +114,16 @@ class AuthConfig:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "AuthConfig":
         return cls(
-            auth_type=AuthType(data.get("auth_type", "none")),
+            auth_type=_AUTH_TYPE_MAP.get(data.get("auth_type"), AuthType.NONE),
             username=data.get("username", ""),
             password=data.get("password", ""),
             bearer_token=data.get("bearer_token", "")
         )
 
 
-@dataclass
+#requests, history entries and collections compare by identity, they are only ever looked up by reference
+
+@dataclass(eq=False, slots=True)
 class RequestModel:
     method: HttpMethod = HttpMethod.GET
     url: str = ""
@@ -139,12 +155,12 @@ class RequestModel:
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "RequestModel":
         return cls(
-            method=HttpMethod(data.get("method", "GET")),
+            method=_METHOD_MAP.get(data.get("method"), HttpMethod.GET),
             url=data.get("url", ""),
             query_params=[KeyValuePair.from_dict(p) for p in data.get("query_params", [])],
             headers=[KeyValuePair.from_dict(h) for h in data.get("headers", [])],
-            body_type=BodyType(data.get("body_type", "none")),
-            raw_body_type=RawBodyType(data.get("raw_body_type", "text")),
+            body_type=_BODY_TYPE_MAP.get(data.get("body_type"), BodyType.NONE),
+            raw_body_type=_RAW_BODY_TYPE_MAP.get(data.get("raw_body_type"), RawBodyType.TEXT),
             raw_body=data.get("raw_body", ""),
             form_data=[KeyValuePair.from_dict(f) for f in data.get("form_data", [])],
             multipart_data=[MultipartItem.from_dict(m) for m in data.get("multipart_data", [])],
@@ -153,28 +169,50 @@ class RequestModel:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class ResponseModel:
     status_code: int = 0
     reason: str = ""
-    headers: Dict[str, str] = field(default_factory=dict)
+    headers: Mapping[str, str] = field(default_factory=dict)
     body_bytes: bytes = b""
-    body_text: str = ""
     time_taken_ms: float = 0.0
     error: Optional[str] = None
+    encoding: Optional[str] = None
+    _body_text: Optional[str] = field(default=None, repr=False)
+    body_pretty: Optional[str] = field(default=None, repr=False)  # formatted json, kept once computed
+    body_path: Optional[str] = None  # temp file holding a large body, body_bytes is then only a preview
+    body_size: int = 0  # full size of a body kept in body_path
+
+    @property
+    def size(self) -> int:
+        return self.body_size if self.body_path else len(self.body_bytes)
+
+    @property
+    def body_text(self) -> str:
+        #decoded on first access and cached
+        if self._body_text is None:
+            try:
+                self._body_text = self.body_bytes.decode(self.encoding or "utf-8", errors="replace")
+            except LookupError:
+                self._body_text = self.body_bytes.decode("utf-8", errors="replace")
+        return self._body_text
+
+    @body_text.setter
+    def body_text(self, value: str) -> None:
+        self._body_text = value
 
     def to_dict(self) -> Dict[str, Any]:
         return {
             "status_code": self.status_code,
             "reason": self.reason,
-            "headers": self.headers,
+            "headers": dict(self.headers),
             "body_text": self.body_text,
             "time_taken_ms": self.time_taken_ms,
             "error": self.error
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Environment:
     name: str = ""
     variables: Dict[str, str] = field(default_factory=dict)
@@ -193,7 +231,7 @@ class Environment:
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Settings:
     default_timeout: int = 30
     ssl_verify: bool = True
@@ -201,6 +239,9 @@ class Settings:
     http_proxy: str = ""
     https_proxy: str = ""
     theme: str = "dark"  # Always dark theme
+    max_highlight_bytes: int = 256 * 1024  # larger bodies are shown without json highlighting
+    max_pretty_bytes: int = 16 * 1024 * 1024  # larger json bodies are shown as received
+    max_concurrent_requests: int = 4
 
     def to_dict(self) -> Dict[str, Any]:
         return {
@@ -209,7 +250,10 @@ class Settings:
             "default_environment": self.default_environment,
             "http_proxy": self.http_proxy,
             "https_proxy": self.https_proxy,
-            "theme": self.theme
+            "theme": self.theme,
+            "max_highlight_bytes": self.max_highlight_bytes,
+            "max_pretty_bytes": self.max_pretty_bytes,
+            "max_concurrent_requests": self.max_concurrent_requests
         }
 
     @classmethod
@@ -220,29 +264,66 @@ class Settings:
             default_environment=data.get("default_environment", "Default"),
             http_proxy=data.get("http_proxy", ""),
             https_proxy=data.get("https_proxy", ""),
-            theme=data.get("theme", "dark")
+            theme=data.get("theme", "dark"),
+            max_highlight_bytes=data.get("max_highlight_bytes", 256 * 1024),
+            max_pretty_bytes=data.get("max_pretty_bytes", 16 * 1024 * 1024),
+            max_concurrent_requests=data.get("max_concurrent_requests", 4)
         )
 
 
-@dataclass
+@dataclass(init=False, eq=False, slots=True)
 class HistoryEntry:
     timestamp: datetime
     method: str
     url: str
     status_code: Optional[int] = None
     name: str = ""
-    request: Optional["RequestModel"] = None
-
-    def __post_init__(self):
+    _request: Optional["RequestModel"] = field(default=None, repr=False)
+    #stored request as read from disk, only turned into a RequestModel when it is opened
+    _request_data: Optional[Dict[str, Any]] = field(default=None, repr=False)
+    _tooltip: Optional[str] = field(default=None, repr=False)
+
+    def __init__(self, timestamp: datetime, method: str, url: str, status_code: Optional[int] = None,
+                 name: str = "", request: Optional["RequestModel"] = None,
+                 request_data: Optional[Dict[str, Any]] = None):
+        self.timestamp = timestamp
+        self.method = method
+        self.url = url
+        self.status_code = status_code
+        self.name = name
+        self._request = request
+        self._request_data = None if request is not None else request_data
+        self._tooltip = None
         if not self.name:
-            #generate a short name from url
+            #generate a short name from url, once per entry since name is stored with it
             try:
-                from urllib.parse import urlparse
                 parsed = urlparse(self.url)
                 self.name = f"{self.method} {parsed.netloc}{parsed.path[:30]}"
             except:
                 self.name = f"{self.method} {self.url[:40]}"
 
+    @property
+    def tooltip(self) -> str:
+        #formatted on first hover and cached
+        if self._tooltip is None:
+            timestamp_str = self.timestamp.strftime("%Y-%m-%d %H:%M:%S")
+            status_info = f" ({self.status_code})" if self.status_code else ""
+            self._tooltip = f"{timestamp_str}{status_info}\n{self.url}"
+        return self._tooltip
+
+    @property
+    def request(self) -> Optional["RequestModel"]:
+        #decoded on first access and cached
+        if self._request is None and self._request_data is not None:
+            self._request = RequestModel.from_dict(self._request_data)
+            self._request_data = None
+        return self._request
+
+    @request.setter
+    def request(self, value: Optional["RequestModel"]) -> None:
+        self._request = value
+        self._request_data = None
+
     def to_dict(self) -> Dict[str, Any]:
         result = {
             "timestamp": self.timestamp.isoformat(),
@@ -251,33 +332,36 @@ class HistoryEntry:
             "status_code": self.status_code,
             "name": self.name
         }
-        if self.request:
-            result["request"] = self.request.to_dict()
+        if self._request:
+            result["request"] = self._request.to_dict()
+        elif self._request_data is not None:
+            #never decoded, write back what was read
+            result["request"] = self._request_data
         return result
 
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "HistoryEntry":
         timestamp_str = data.get("timestamp", "")
-        try:
-            timestamp = datetime.fromisoformat(timestamp_str)
-        except:
+        timestamp = None
+        if timestamp_str:
+            try:
+                timestamp = datetime.fromisoformat(timestamp_str)
+            except (ValueError, TypeError):
+                pass
+        if timestamp is None:
             timestamp = datetime.now()
         
-        request = None
-        if "request" in data:
-            request = RequestModel.from_dict(data["request"])
-        
         return cls(
             timestamp=timestamp,
             method=data.get("method", "GET"),
             url=data.get("url", ""),
             status_code=data.get("status_code"),
             name=data.get("name", ""),
-            request=request
+            request_data=data.get("request")
         )
 
 
-@dataclass
+@dataclass(eq=False, slots=True)
 class CollectionItem:
     name: str = ""
     request: RequestModel = field(default_factory=RequestModel)
@@ -296,7 +380,7 @@ class CollectionItem:
         )
 
 
-@dataclass
+@dataclass(eq=False, slots=True)
 class Collection:
     name: str = ""
     items: List[CollectionItem] = field(default_factory=list)
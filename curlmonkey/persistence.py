@@ -2,15 +2,34 @@
 
 import json
 import logging
+import os
+import tempfile
+import threading
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
 from pathlib import Path
-from typing import List, Dict, Optional
+from typing import Any, Iterable, List, Dict, Optional
 import platform
 
 from .models import Settings, HistoryEntry, Collection, Environment
 
 logger = logging.getLogger(__name__)
 
+#history is an append-only log, one json object per line, oldest first
 
+MAX_HISTORY_ENTRIES = 1000
+_COMPACT_EVERY = 100
+_appends_since_compact = 0
+
+#history is written from the save pool, the sidebar loader and the exit path, one writer at a time
+
+_history_lock = threading.RLock()
+
+
+#the data directory cannot change while running, resolve and create it once
+
+@lru_cache(maxsize=1)
 def get_data_dir() -> Path:
     system = platform.system()
     if system == "Windows":
@@ -25,22 +44,55 @@ def get_data_dir() -> Path:
     return data_dir
 
 
+@lru_cache(maxsize=1)
 def get_settings_path() -> Path:
     return get_data_dir() / "settings.json"
 
 
+@lru_cache(maxsize=1)
 def get_history_path() -> Path:
+    return get_data_dir() / "history.jsonl"
+
+
+@lru_cache(maxsize=1)
+def get_legacy_history_path() -> Path:
     return get_data_dir() / "history.json"
 
 
+@lru_cache(maxsize=1)
 def get_collections_path() -> Path:
     return get_data_dir() / "collections.json"
 
 
+@lru_cache(maxsize=1)
 def get_environments_path() -> Path:
     return get_data_dir() / "environments.json"
 
 
+#whole files go through one buffer each way; json.dump to a file would issue a write per token
+
+def _read_json(path: Path):
+    return json.loads(path.read_bytes())
+
+
+def _write_text_atomic(path: Path, text: str) -> None:
+    #write next to the target and swap it in, a crash mid-write leaves the old file intact
+    #every writer gets its own temp name, so concurrent saves of one file never share it
+    with tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.name + ".", suffix=".tmp", delete=False) as f:
+        tmp_path = f.name
+        try:
+            f.write(text.encode("utf-8"))
+        except BaseException:
+            f.close()
+            os.unlink(tmp_path)
+            raise
+    os.replace(tmp_path, path)
+
+
+def _write_json(path: Path, data, indent: Optional[int] = 2) -> None:
+    _write_text_atomic(path, json.dumps(data, indent=indent))
+
+
 def load_settings() -> Settings:
     settings_path = get_settings_path()
     if not settings_path.exists():
@@ -48,8 +100,7 @@ def load_settings() -> Settings:
         return Settings()
     
     try:
-        with open(settings_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _read_json(settings_path)
         return Settings.from_dict(data)
     except Exception as e:
         logger.error(f"Error loading settings: {e}")
@@ -59,44 +110,92 @@ def load_settings() -> Settings:
 def save_settings(settings: Settings) -> None:
     settings_path = get_settings_path()
     try:
-        with open(settings_path, "w", encoding="utf-8") as f:
-            json.dump(settings.to_dict(), f, indent=2)
+        _write_json(settings_path, settings.to_dict())
         logger.info("Settings saved successfully")
     except Exception as e:
         logger.error(f"Error saving settings: {e}")
 
 
+def _migrate_legacy_history(history_path: Path) -> None:
+    #older versions kept history as one json array, newest first
+    legacy_path = get_legacy_history_path()
+    with _history_lock:
+        if history_path.exists() or not legacy_path.exists():
+            return
+        try:
+            entries = [HistoryEntry.from_dict(entry) for entry in _read_json(legacy_path)]
+            save_history(entries)
+            legacy_path.unlink()
+            logger.info(f"Migrated {len(entries)} history entries to {history_path.name}")
+        except Exception as e:
+            logger.error(f"Error migrating history: {e}")
+
+
 def load_history() -> List[HistoryEntry]:
     history_path = get_history_path()
+    _migrate_legacy_history(history_path)
     if not history_path.exists():
         return []
     
     try:
         with open(history_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
-        return [HistoryEntry.from_dict(entry) for entry in data]
+            lines = deque(f, maxlen=MAX_HISTORY_ENTRIES)
     except Exception as e:
         logger.error(f"Error loading history: {e}")
         return []
+    
+    entries = []
+    for line in reversed(lines):
+        if not line.strip():
+            continue
+        try:
+            entries.append(HistoryEntry.from_dict(json.loads(line)))
+        except Exception as e:
+            #a torn last write only costs that one entry
+            logger.warning(f"Skipping unreadable history line: {e}")
+    return entries
 
 
 def save_history(history: List[HistoryEntry]) -> None:
     history_path = get_history_path()
     try:
-        with open(history_path, "w", encoding="utf-8") as f:
-            json.dump([entry.to_dict() for entry in history], f, indent=2)
-        logger.info(f"History saved: {len(history)} entries")
+        lines = [json.dumps(entry.to_dict()) + "\n" for entry in reversed(history[:MAX_HISTORY_ENTRIES])]
+        with _history_lock:
+            _write_text_atomic(history_path, "".join(lines))
+        logger.debug(f"History saved: {len(history)} entries")
     except Exception as e:
         logger.error(f"Error saving history: {e}")
 
 
+def compact_history() -> None:
+    #drop everything older than the newest MAX_HISTORY_ENTRIES lines, no append may land in between
+    with _history_lock:
+        save_history(load_history())
+
+
 def add_history_entry(entry: HistoryEntry) -> None:
-    history = load_history()
-    history.insert(0, entry)  #add to beginning
-    #keep only last 1000 entries
-    
-    history = history[:1000]
-    save_history(history)
+    add_history_entries([entry])
+
+
+def add_history_entries(entries: List[HistoryEntry]) -> None:
+    global _appends_since_compact
+    if not entries:
+        return
+    history_path = get_history_path()
+    text = "".join(json.dumps(entry.to_dict()) + "\n" for entry in entries)
+    with _history_lock:
+        _migrate_legacy_history(history_path)
+        try:
+            with open(history_path, "a", encoding="utf-8") as f:
+                f.write(text)
+        except Exception as e:
+            logger.error(f"Error saving history entries: {e}")
+            return
+        
+        _appends_since_compact += len(entries)
+        if _appends_since_compact >= _COMPACT_EVERY:
+            _appends_since_compact = 0
+            compact_history()
 
 
 def clear_history() -> None:
@@ -109,8 +208,7 @@ def load_collections() -> List[Collection]:
         return []
     
     try:
-        with open(collections_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _read_json(collections_path)
         return [Collection.from_dict(coll) for coll in data]
     except Exception as e:
         logger.error(f"Error loading collections: {e}")
@@ -120,13 +218,21 @@ def load_collections() -> List[Collection]:
 def save_collections(collections: List[Collection]) -> None:
     collections_path = get_collections_path()
     try:
-        with open(collections_path, "w", encoding="utf-8") as f:
-            json.dump([coll.to_dict() for coll in collections], f, indent=2)
-        logger.info(f"Collections saved: {len(collections)} collections")
+        _write_json(collections_path, [coll.to_dict() for coll in collections])
+        logger.debug(f"Collections saved: {len(collections)} collections")
     except Exception as e:
         logger.error(f"Error saving collections: {e}")
 
 
+def write_collections_file(path: Path, collections: List[Collection]) -> None:
+    #exports use the same atomic write as the collections file, errors go to the caller
+    _write_json(path, [coll.to_dict() for coll in collections])
+
+
+def read_collections_file(path: Path) -> List[Collection]:
+    return [Collection.from_dict(coll) for coll in _read_json(path)]
+
+
 def load_environments() -> Dict[str, Environment]:
     environments_path = get_environments_path()
     if not environments_path.exists():
@@ -137,8 +243,7 @@ def load_environments() -> Dict[str, Environment]:
         return envs
     
     try:
-        with open(environments_path, "r", encoding="utf-8") as f:
-            data = json.load(f)
+        data = _read_json(environments_path)
         return {name: Environment.from_dict(env_data) for name, env_data in data.items()}
     except Exception as e:
         logger.error(f"Error loading environments: {e}")
@@ -149,10 +254,26 @@ def load_environments() -> Dict[str, Environment]:
 def save_environments(environments: Dict[str, Environment]) -> None:
     environments_path = get_environments_path()
     try:
-        with open(environments_path, "w", encoding="utf-8") as f:
-            data = {name: env.to_dict() for name, env in environments.items()}
-            json.dump(data, f, indent=2)
-        logger.info(f"Environments saved: {len(environments)} environments")
+        data = {name: env.to_dict() for name, env in environments.items()}
+        _write_json(environments_path, data)
+        logger.debug(f"Environments saved: {len(environments)} environments")
     except Exception as e:
         logger.error(f"Error saving environments: {e}")
 
+
+#files that load_all can read, each loader handles its own errors
+
+_LOADERS = {
+    "settings": load_settings,
+    "history": load_history,
+    "collections": load_collections,
+    "environments": load_environments,
+}
+
+
+def load_all(names: Iterable[str] = ("settings", "history", "collections", "environments")) -> Dict[str, Any]:
+    #the files are independent, read and parse them side by side
+    names = list(names)
+    with ThreadPoolExecutor(max_workers=len(names)) as pool:
+        futures = {name: pool.submit(_LOADERS[name]) for name in names}
+    return {name: future.result() for name, future in futures.items()}
@@ -2,23 +2,86 @@
 
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QTreeWidget, QTreeWidgetItem,
-    QPushButton, QListWidget, QListWidgetItem, QLabel, QTabWidget,
+    QPushButton, QListView, QLabel, QTabWidget,
     QMenu, QInputDialog, QMessageBox
 )
-from PySide6.QtCore import Qt, Signal
+from PySide6.QtCore import Qt, Signal, QAbstractListModel, QModelIndex, QPersistentModelIndex
+from collections import deque
 from datetime import datetime
 
-from .models import RequestModel, HistoryEntry, Collection, CollectionItem
+from .models import RequestModel, HistoryEntry, Collection, CollectionItem, HttpMethod
+
+_HTTP_METHOD_MAP = HttpMethod._value2member_map_
+
+#the history list never shows more than this many entries
+
+MAX_VISIBLE_HISTORY = 1000
+
+#make tree styling consistent with tables
+
+_COLLECTIONS_HEADER_QSS = """
+QHeaderView::section {
+    border-right: 2px solid palette(mid);
+    background-color: palette(alternateBase);
+}
+"""
+
+
+class HistoryListModel(QAbstractListModel):
+    """List model over the history entries, rows are built only when the view asks."""
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        #newest first, the cap drops the oldest entry on its own
+        self.entries = deque(maxlen=MAX_VISIBLE_HISTORY)
+    
+    def rowCount(self, parent=QModelIndex()):
+        if parent.isValid():
+            return 0
+        return len(self.entries)
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        entry = self.entries[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return entry.name
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return entry.tooltip
+        if role == Qt.ItemDataRole.UserRole:
+            return entry
+        return None
+    
+    def set_entries(self, entries: list[HistoryEntry]):
+        self.beginResetModel()
+        self.entries = deque(entries[:MAX_VISIBLE_HISTORY], maxlen=MAX_VISIBLE_HISTORY)
+        self.endResetModel()
+    
+    def prepend(self, entry: HistoryEntry):
+        if len(self.entries) == MAX_VISIBLE_HISTORY:
+            last = MAX_VISIBLE_HISTORY - 1
+            self.beginRemoveRows(QModelIndex(), last, last)
+            self.entries.pop()
+            self.endRemoveRows()
+        self.beginInsertRows(QModelIndex(), 0, 0)
+        self.entries.appendleft(entry)
+        self.endInsertRows()
+    
+    def remove_row(self, row: int):
+        self.beginRemoveRows(QModelIndex(), row, row)
+        del self.entries[row]
+        self.endRemoveRows()
 
 
 class HistoryWidget(QWidget):
     """History sidebar widget."""
     
     request_selected = Signal(RequestModel)
+    history_cleared = Signal()
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.history_entries = []
+        self.history_model = HistoryListModel(self)
         self.init_ui()
     
     def init_ui(self):
@@ -36,71 +99,51 @@ class HistoryWidget(QWidget):
         
         layout.addLayout(header_layout)
         #history list
-        self.history_list = QListWidget()
-        self.history_list.itemDoubleClicked.connect(self.on_item_double_clicked)
+        self.history_list = QListView()
+        self.history_list.setModel(self.history_model)
+        self.history_list.setEditTriggers(QListView.EditTrigger.NoEditTriggers)
+        #every row is one line of text, so the view can size them all from the first
+        self.history_list.setUniformItemSizes(True)
+        self.history_list.doubleClicked.connect(self.on_item_double_clicked)
         self.history_list.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         self.history_list.customContextMenuRequested.connect(self.show_context_menu)
         self.history_list.setAlternatingRowColors(True)
         layout.addWidget(self.history_list)
     
     def load_history(self, entries: list[HistoryEntry]):
-        self.history_entries = entries
-        self.history_list.clear()
-        
-        for entry in entries:
-            item = QListWidgetItem(entry.name)
-            item.setData(Qt.ItemDataRole.UserRole, entry)
-            #add timestamp as tooltip
-            timestamp_str = entry.timestamp.strftime("%Y-%m-%d %H:%M:%S")
-            status_info = f" ({entry.status_code})" if entry.status_code else ""
-            item.setToolTip(f"{timestamp_str}{status_info}\n{entry.url}")
-            self.history_list.addItem(item)
+        self.history_model.set_entries(entries)
     
     def add_entry(self, entry: HistoryEntry):
-        self.history_entries.insert(0, entry)
-        item = QListWidgetItem(entry.name)
-        item.setData(Qt.ItemDataRole.UserRole, entry)
-        timestamp_str = entry.timestamp.strftime("%Y-%m-%d %H:%M:%S")
-        status_info = f" ({entry.status_code})" if entry.status_code else ""
-        item.setToolTip(f"{timestamp_str}{status_info}\n{entry.url}")
-        self.history_list.insertItem(0, item)
-        #keep only last 1000 visible
-        if self.history_list.count() > 1000:
-            self.history_list.takeItem(self.history_list.count() - 1)
-    
-    def on_item_double_clicked(self, item: QListWidgetItem):
-        entry = item.data(Qt.ItemDataRole.UserRole)
+        self.history_model.prepend(entry)
+    
+    def on_item_double_clicked(self, index: QModelIndex):
+        entry = index.data(Qt.ItemDataRole.UserRole)
         if entry:
             #use stored full request if available, otherwise create minimal request
-            if entry.request:
-                self.request_selected.emit(entry.request)
+            request = entry.request
+            if request:
+                self.request_selected.emit(request)
             else:
-                from .models import HttpMethod
                 request = RequestModel()
-                try:
-                    request.method = HttpMethod(entry.method)
-                except (ValueError, AttributeError):
-                    request.method = HttpMethod.GET
+                request.method = _HTTP_METHOD_MAP.get(entry.method, HttpMethod.GET)
                 request.url = entry.url
                 self.request_selected.emit(request)
     
     def show_context_menu(self, position):
-        item = self.history_list.itemAt(position)
-        if not item:
+        index = self.history_list.indexAt(position)
+        if not index.isValid():
             return
         
+        #the menu runs its own event loop, rows can move or go away before an action fires
+        entry_index = QPersistentModelIndex(index)
         menu = QMenu(self)
         delete_action = menu.addAction("Delete")
-        delete_action.triggered.connect(lambda: self.delete_item(item))
+        delete_action.triggered.connect(lambda: self.delete_item(entry_index))
         menu.exec(self.history_list.mapToGlobal(position))
     
-    def delete_item(self, item: QListWidgetItem):
-        row = self.history_list.row(item)
-        if row >= 0:
-            self.history_list.takeItem(row)
-            entry = item.data(Qt.ItemDataRole.UserRole)
-            if entry in self.history_entries:
-                self.history_entries.remove(entry)
+    def delete_item(self, index: QPersistentModelIndex):
+        if index.isValid():
+            self.history_model.remove_row(index.row())
     
     def clear_history(self):
         reply = QMessageBox.question(
@@ -109,11 +152,11 @@ class HistoryWidget(QWidget):
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         if reply == QMessageBox.StandardButton.Yes:
-            self.history_list.clear()
-            self.history_entries.clear()
+            self.history_model.set_entries([])
+            self.history_cleared.emit()
     
     def get_all_entries(self) -> list[HistoryEntry]:
-        return self.history_entries
+        return list(self.history_model.entries)
 
 
 class CollectionsWidget(QWidget):
@@ -150,14 +193,7 @@ class CollectionsWidget(QWidget):
         self.collections_tree.customContextMenuRequested.connect(self.show_context_menu)
         self.collections_tree.setAlternatingRowColors(True)
         
-        #make tree styling consistent with tables
-
-        self.collections_tree.header().setStyleSheet("""
-            QHeaderView::section {
-                border-right: 2px solid palette(mid);
-                background-color: palette(alternateBase);
-            }
-        """)
+        self.collections_tree.header().setStyleSheet(_COLLECTIONS_HEADER_QSS)
         layout.addWidget(self.collections_tree)
     
     def load_collections(self, collections: list[Collection]):
@@ -215,7 +251,7 @@ class CollectionsWidget(QWidget):
             add_request_action.triggered.connect(lambda: self.add_request_dialog(data))
             menu.addSeparator()
             delete_action = menu.addAction("Delete Collection")
-            delete_action.triggered.connect(lambda: self.delete_collection(data))
+            delete_action.triggered.connect(lambda: self.delete_collection(item, data))
         elif isinstance(data, CollectionItem):
             delete_action = menu.addAction("Delete Request")
             delete_action.triggered.connect(lambda: self.delete_request(item, data))
@@ -225,15 +261,17 @@ class CollectionsWidget(QWidget):
     def add_request_dialog(self, collection: Collection):
         pass
     
-    def delete_collection(self, collection: Collection):
+    def delete_collection(self, item: QTreeWidgetItem, collection: Collection):
         reply = QMessageBox.question(
             self, "Delete Collection",
             f"Are you sure you want to delete '{collection.name}'?",
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         if reply == QMessageBox.StandardButton.Yes:
-            if collection in self.collections:
-                self.collections.remove(collection)
+            #tree rows mirror the list, so the row is the index
+            row = self.collections_tree.indexOfTopLevelItem(item)
+            if 0 <= row < len(self.collections):
+                self.collections.pop(row)
             self.refresh_tree()
     
     def delete_request(self, item: QTreeWidgetItem, collection_item: CollectionItem):
@@ -241,8 +279,9 @@ class CollectionsWidget(QWidget):
         if parent:
             collection = parent.data(0, Qt.ItemDataRole.UserRole)
             if isinstance(collection, Collection):
-                if collection_item in collection.items:
-                    collection.items.remove(collection_item)
+                row = parent.indexOfChild(item)
+                if 0 <= row < len(collection.items):
+                    collection.items.pop(row)
                 self.refresh_tree()
     
     def get_all_collections(self) -> list[Collection]:
@@ -2,86 +2,359 @@
 
 import json
 import logging
+import re
+import shutil
+import threading
 from datetime import datetime
+from pathlib import Path
+from functools import lru_cache
 from typing import Dict
 from PySide6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QHBoxLayout, QSplitter,
-    QComboBox, QLineEdit, QPushButton, QTabWidget, QTableWidget,
-    QTableWidgetItem, QPlainTextEdit, QLabel, QStatusBar, QMenuBar,
+    QComboBox, QLineEdit, QPushButton, QTabWidget, QTableView,
+    QStyledItemDelegate, QPlainTextEdit, QLabel, QStatusBar, QMenuBar,
     QMessageBox, QDialog, QRadioButton, QButtonGroup, QFileDialog,
-    QHeaderView, QCheckBox, QGroupBox, QFormLayout, QSpinBox
+    QHeaderView, QCheckBox, QGroupBox, QFormLayout, QSpinBox, QInputDialog
 )
-from PySide6.QtCore import Qt, QThread, Signal
-from PySide6.QtGui import QClipboard, QShortcut, QKeySequence, QTextCharFormat, QColor, QSyntaxHighlighter, QIcon
+from PySide6.QtCore import Qt, QObject, QRunnable, QThreadPool, QTimer, Signal, QAbstractTableModel, QModelIndex, QStringListModel, QSignalBlocker
+from PySide6.QtGui import QGuiApplication, QShortcut, QKeySequence, QTextCharFormat, QColor, QSyntaxHighlighter, QIcon
 
 from .models import (
     RequestModel, ResponseModel, HttpMethod, BodyType, RawBodyType,
     AuthType, KeyValuePair, MultipartItem, AuthConfig, HistoryEntry, Environment
 )
-from .http_client import send_request
-from .curl_export import generate_curl_command
-from .curl_import import parse_curl_command
-from .ui_settings import SettingsDialog
+from .persistence import (
+    save_environments, add_history_entries, save_settings, save_collections,
+    write_collections_file, read_collections_file
+)
+from .http_client import SessionCache, send_request
 from .ui_history import HistoryWidget, CollectionsWidget
 
 logger = logging.getLogger(__name__)
 
+#json highlighting patterns, compiled once for every block of every response
+
+#a string is a key when the lookahead finds a colon after it, so keys and values share one pass
+
+_JSON_TOKEN_RE = re.compile(
+    r'"(?:[^"\\]|\\.)*"(?=\s*(:?))'
+    r'|-?\b\d+(?:\.\d+)?(?:[eE][+-]?\d+)?\b'
+    r'|\b(?:true|false|null)\b'
+)
+
+#single pass scanner: jump to the next character that can start a token, then read that token
+
+_JSON_TOKEN_START_RE = re.compile(r'["tfn0-9-]')
+_JSON_NUMBER_AT_RE = re.compile(r'-?\d+(?:\.\d+)?(?:[eE][+-]?\d+)?')
+
+#very long single-line blocks (minified bodies) go through the regex passes, whose matching stays in C
+
+_SCANNER_MAX_BLOCK = 64 * 1024
+
+#response text past this many characters goes into the viewers one chunk per event loop turn
+
+_TEXT_CHUNK_CHARS = 1_000_000
+
+
+_EMPTY_SUMMARY = "Status: -    Time: -    Size: -"
+
+
+def format_size(size_bytes: int) -> str:
+    if size_bytes < 1024:
+        return f"{size_bytes} B"
+    if size_bytes < 1024 * 1024:
+        return f"{size_bytes / 1024:.2f} KB"
+    return f"{size_bytes / (1024 * 1024):.2f} MB"
+
+
+def set_fixed_sections(table: QTableView) -> None:
+    #section sizes never follow the contents, measuring every row is what stalls large tables
+    header = table.horizontalHeader()
+    header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+    header.setDefaultSectionSize(180)
+    rows = table.verticalHeader()
+    rows.setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+    rows.setDefaultSectionSize(24)
+
+
+def remove_selected_table_rows(table: QTableView) -> None:
+    #selection ranges give the rows directly, without visiting every selected cell
+    rows = set()
+    for selection_range in table.selectionModel().selection():
+        rows.update(range(selection_range.top(), selection_range.bottom() + 1))
+    #drop contiguous runs from the bottom up, one removeRows call each
+    model = table.model()
+    ordered = sorted(rows, reverse=True)
+    start = 0
+    for i in range(1, len(ordered) + 1):
+        if i == len(ordered) or ordered[i] != ordered[i - 1] - 1:
+            model.removeRows(ordered[i - 1], ordered[start] - ordered[i - 1] + 1)
+            start = i
+
+
+def _chunk_end(text: str, start: int) -> int:
+    #chunks end at a line break so each one can be appended as whole blocks
+    if len(text) - start <= _TEXT_CHUNK_CHARS:
+        return len(text)
+    end = text.find("\n", start + _TEXT_CHUNK_CHARS)
+    return len(text) if end == -1 else end
+
+
+def pretty_print_json(text: str) -> str:
+    #parsing is already C, keeping non-ascii as is spares the encoder the escaping work
+    return json.dumps(json.loads(text), indent=2, ensure_ascii=False)
+
+#stylesheets are shared by every widget that uses them, so each string is handed to qt as the same object
+
+_CHECK_TABLE_HEADER_QSS = """
+    QHeaderView::section {
+        border-right: 2px solid palette(mid);
+        background-color: palette(alternateBase);
+    }
+    QHeaderView::section:first {
+        border-right: 3px solid palette(dark);
+    }
+"""
+
+_TABLE_HEADER_QSS = """
+    QHeaderView::section {
+        border-right: 2px solid palette(mid);
+        background-color: palette(alternateBase);
+    }
+"""
+
+_MENUBAR_QSS = """
+    QMenuBar {
+        background-color: #353535;
+        color: #ffffff;
+        border-bottom: 1px solid #555555;
+    }
+    QMenuBar::item {
+        background-color: transparent;
+        color: #ffffff;
+        padding: 4px 8px;
+    }
+    QMenuBar::item:selected {
+        background-color: #454545;
+        color: #ffffff;
+    }
+    QMenuBar::item:pressed {
+        background-color: #2a82da;
+        color: #ffffff;
+    }
+"""
+
+_MENU_QSS = """
+    QMenu {
+        background-color: #353535;
+        color: #ffffff;
+        border: 1px solid #555555;
+    }
+    QMenu::item {
+        background-color: transparent;
+        color: #ffffff;
+        padding: 6px 32px 6px 8px;
+    }
+    QMenu::item:selected {
+        background-color: #2a82da;
+        color: #ffffff;
+    }
+    QMenu::item:disabled {
+        color: #888888;
+    }
+    QMenu::separator {
+        height: 1px;
+        background-color: #555555;
+        margin: 4px 0px;
+    }
+"""
+
+#item flags are the same for every row, so they are combined once here
+
+_CHECKBOX_FLAGS = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsUserCheckable
+_EDITABLE_FLAGS = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable | Qt.ItemFlag.ItemIsEditable
+
+
+_JSON_KEY_COLOR = QColor(136, 19, 145)  # Purple
+_JSON_STRING_COLOR = QColor(26, 26, 166)  # Blue
+_JSON_NUMBER_COLOR = QColor(28, 0, 207)  # Dark blue
+_JSON_BOOL_COLOR = QColor(0, 0, 255)  # Blue
+_JSON_NULL_COLOR = QColor(128, 128, 128)  # Gray
+
+
+@lru_cache(maxsize=None)
+def _json_formats():
+    #built on first use, once a gui application exists, and shared by every highlighter instance
+    formats = []
+    for color in (_JSON_KEY_COLOR, _JSON_STRING_COLOR, _JSON_NUMBER_COLOR, _JSON_BOOL_COLOR, _JSON_NULL_COLOR):
+        fmt = QTextCharFormat()
+        fmt.setForeground(color)
+        formats.append(fmt)
+    return tuple(formats)
+
 
 class JsonHighlighter(QSyntaxHighlighter):
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.key_format = QTextCharFormat()
-        self.key_format.setForeground(QColor(136, 19, 145))  # Purple
-        
-        self.string_format = QTextCharFormat()
-        self.string_format.setForeground(QColor(26, 26, 166))  # Blue
-        
-        self.number_format = QTextCharFormat()
-        self.number_format.setForeground(QColor(28, 0, 207))  # Dark blue
-        
-        self.bool_format = QTextCharFormat()
-        self.bool_format.setForeground(QColor(0, 0, 255))  # Blue
-        
-        self.null_format = QTextCharFormat()
-        self.null_format.setForeground(QColor(128, 128, 128))  # Gray
+        (self.key_format, self.string_format, self.number_format,
+         self.bool_format, self.null_format) = _json_formats()
     
     def highlightBlock(self, text):
-        import re
-        #simple highlighting
-        for match in re.finditer(r'"([^"]+)":', text):
-            self.setFormat(match.start(), match.end(), self.key_format)
-        #strings
-        for match in re.finditer(r'"[^"]*"', text):
-            if ':' not in match.group() or match.group().endswith(':'):
-                continue
-            self.setFormat(match.start(), match.end(), self.string_format)
-        #numbers
-        for match in re.finditer(r'\b\d+\.?\d*\b', text):
-            self.setFormat(match.start(), match.end(), self.number_format)
-        #booleans and null
-        for match in re.finditer(r'\b(true|false|null)\b', text):
-            self.setFormat(match.start(), match.end(), self.bool_format if match.group() in ('true', 'false') else self.null_format)
-
-
-class RequestWorker(QThread):
-    
-    finished = Signal(ResponseModel)
-    error = Signal(str)
+        if len(text) > _SCANNER_MAX_BLOCK:
+            self.highlight_with_regex(text)
+        else:
+            self.highlight_with_scanner(text)
+    
+    def highlight_with_scanner(self, text):
+        set_format = self.setFormat
+        key_format = self.key_format
+        string_format = self.string_format
+        number_format = self.number_format
+        bool_format = self.bool_format
+        null_format = self.null_format
+        next_token = _JSON_TOKEN_START_RE.search
+        match_number = _JSON_NUMBER_AT_RE.match
+        find = text.find
+        startswith = text.startswith
+        n = len(text)
+        
+        match = next_token(text)
+        while match:
+            i = match.start()
+            c = text[i]
+            end = i + 1
+            if c == '"':
+                #closing quote, skipping escaped ones
+                j = find('"', i + 1)
+                while j != -1:
+                    k = j - 1
+                    while text[k] == '\\':
+                        k -= 1
+                    if (j - 1 - k) % 2 == 0:
+                        break
+                    j = find('"', j + 1)
+                end = n if j == -1 else j + 1
+                #a string followed by a colon is a key
+                k = end
+                while k < n and text[k] in ' \t':
+                    k += 1
+                set_format(i, end - i, key_format if k < n and text[k] == ':' else string_format)
+            elif c == 't' or c == 'f' or c == 'n':
+                if startswith('true', i):
+                    end = i + 4
+                    set_format(i, 4, bool_format)
+                elif startswith('false', i):
+                    end = i + 5
+                    set_format(i, 5, bool_format)
+                elif startswith('null', i):
+                    end = i + 4
+                    set_format(i, 4, null_format)
+            else:
+                number = match_number(text, i)
+                if number:
+                    end = number.end()
+                    set_format(i, end - i, number_format)
+            match = next_token(text, end)
     
-    def __init__(self, request: RequestModel, settings, environments):
+    def highlight_with_regex(self, text):
+        set_format = self.setFormat
+        key_format = self.key_format
+        string_format = self.string_format
+        number_format = self.number_format
+        bool_format = self.bool_format
+        null_format = self.null_format
+        #one alternation pass: a string is consumed whole, so digits and words inside it are never matched
+        for match in _JSON_TOKEN_RE.finditer(text):
+            start = match.start()
+            first = text[start]
+            if first == '"':
+                fmt = key_format if match.group(1) else string_format
+            elif first == 't' or first == 'f':
+                fmt = bool_format
+            elif first == 'n':
+                fmt = null_format
+            else:
+                fmt = number_format
+            set_format(start, match.end() - start, fmt)
+
+
+class RequestSignals(QObject):
+    
+    #each result carries the generation of the send that started it
+    finished = Signal(ResponseModel, int)
+    error = Signal(str, int)
+
+
+class RequestWorker(QRunnable):
+    
+    def __init__(self, request: RequestModel, settings, environments, sessions: SessionCache = None,
+                 generation: int = 0):
         super().__init__()
         self.request = request
+        self.generation = generation
         self.settings = settings
         self.environments = environments
+        self.sessions = sessions
+        #runnables are not QObjects, results go out through a separate emitter
+        self.signals = RequestSignals()
+        #set from the gui thread when a newer request replaces this one
+        self.cancel_event = threading.Event()
     
     def run(self):
         try:
-            response = send_request(self.request, self.settings, self.environments)
-            self.finished.emit(response)
+            response = send_request(self.request, self.settings, self.environments, self.cancel_event, self.sessions)
+            if self.cancel_event.is_set():
+                if response.body_path:
+                    Path(response.body_path).unlink(missing_ok=True)
+                return
+            #decode and format here so the gui thread gets the text ready made
+            body_text = response.body_text
+            content_type = response.headers.get("Content-Type", "").lower()
+            if ("json" in content_type and not response.body_path
+                    and response.size <= self.settings.max_pretty_bytes):
+                try:
+                    response.body_pretty = pretty_print_json(body_text)
+                except (ValueError, RecursionError):
+                    pass
+            self.signals.finished.emit(response, self.generation)
         except Exception as e:
             logger.error(f"Request worker error: {e}", exc_info=True)
-            self.error.emit(str(e))
+            self.signals.error.emit(str(e), self.generation)
+
+
+class CurlParseSignals(QObject):
+    
+    finished = Signal(RequestModel)
+    error = Signal(str)
+
+
+class CurlParseWorker(QRunnable):
+    
+    def __init__(self, text: str):
+        super().__init__()
+        self.text = text
+        self.signals = CurlParseSignals()
+    
+    def run(self):
+        try:
+            from .curl_import import parse_curl_command
+            request = parse_curl_command(self.text)
+            self.signals.finished.emit(request)
+        except Exception as e:
+            self.signals.error.emit(str(e))
+
+
+class SaveWorker(QRunnable):
+    #runs one persistence call off the gui thread, the caller passes data it no longer mutates
+    
+    def __init__(self, save, data):
+        super().__init__()
+        self.save = save
+        self.data = data
+    
+    def run(self):
+        self.save(self.data)
 
 
 class CurlImportDialog(QDialog):
@@ -89,6 +362,7 @@ class CurlImportDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
         self.request = None
+        self.parse_worker = None
         self.init_ui()
     
     def init_ui(self):
@@ -123,11 +397,22 @@ class CurlImportDialog(QDialog):
             QMessageBox.warning(self, "Error", "Please enter a cURL command.")
             return
         
-        try:
-            self.request = parse_curl_command(curl_text)
-            self.accept()
-        except Exception as e:
-            QMessageBox.critical(self, "Parse Error", f"Failed to parse cURL command:\n{str(e)}")
+        #large pasted commands are parsed on the pool so the dialog stays responsive
+        self.import_button.setEnabled(False)
+        self.parse_worker = CurlParseWorker(curl_text)
+        self.parse_worker.signals.finished.connect(self.on_parse_finished)
+        self.parse_worker.signals.error.connect(self.on_parse_error)
+        QThreadPool.globalInstance().start(self.parse_worker)
+    
+    def on_parse_finished(self, request: RequestModel):
+        self.parse_worker = None
+        self.request = request
+        self.accept()
+    
+    def on_parse_error(self, error: str):
+        self.parse_worker = None
+        self.import_button.setEnabled(True)
+        QMessageBox.critical(self, "Parse Error", f"Failed to parse cURL command:\n{error}")
 
 
 class CurlExportDialog(QDialog):
@@ -164,17 +449,302 @@ class CurlExportDialog(QDialog):
         layout.addLayout(button_layout)
     
     def copy_to_clipboard(self):
-        clipboard = QClipboard()
-        clipboard.setText(self.curl_edit.toPlainText())
+        QGuiApplication.clipboard().setText(self.curl_edit.toPlainText())
         QMessageBox.information(self, "Copied", "cURL command copied to clipboard!")
 
 
-class KeyValueTable(QTableWidget):
+class KeyValueModel(QAbstractTableModel):
+    """Enabled / key / value rows backed by a plain list of KeyValuePair."""
+    
+    HEADERS = ["Enabled", "Key", "Value"]
     
     def __init__(self, parent=None):
         super().__init__(parent)
-        self.setColumnCount(3)
-        self.setHorizontalHeaderLabels(["Enabled", "Key", "Value"])
+        self.rows: list[KeyValuePair] = []
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 3
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        pair = self.rows[index.row()]
+        column = index.column()
+        if column == 0:
+            if role == Qt.ItemDataRole.CheckStateRole:
+                return Qt.CheckState.Checked if pair.enabled else Qt.CheckState.Unchecked
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return pair.key if column == 1 else pair.value
+        return None
+    
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid():
+            return False
+        pair = self.rows[index.row()]
+        column = index.column()
+        if column == 0 and role == Qt.ItemDataRole.CheckStateRole:
+            pair.enabled = Qt.CheckState(value) == Qt.CheckState.Checked
+        elif column == 1 and role == Qt.ItemDataRole.EditRole:
+            pair.key = value
+        elif column == 2 and role == Qt.ItemDataRole.EditRole:
+            pair.value = value
+        else:
+            return False
+        self.dataChanged.emit(index, index, [role])
+        return True
+    
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        #enabled column is only a checkbox, the text columns are editable
+        if index.column() == 0:
+            return _CHECKBOX_FLAGS
+        return _EDITABLE_FLAGS
+    
+    def set_rows(self, rows: list[KeyValuePair]):
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
+    
+    def append_row(self, pair: KeyValuePair):
+        row = len(self.rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.rows.append(pair)
+        self.endInsertRows()
+    
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if parent.isValid() or row < 0 or row + count > len(self.rows):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self.rows[row:row + count]
+        self.endRemoveRows()
+        return True
+
+
+class HeadersModel(QAbstractTableModel):
+    """Read-only key / value rows for the response headers."""
+    
+    HEADERS = ["Key", "Value"]
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows: list[tuple[str, str]] = []
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 2
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role != Qt.ItemDataRole.DisplayRole:
+            return None
+        return self.rows[index.row()][index.column()]
+    
+    def set_rows(self, rows: list[tuple[str, str]]):
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
+
+
+class EnvVarsModel(QAbstractTableModel):
+    """Name / value rows that edit an environment's variables dict in place."""
+    
+    HEADERS = ["Name", "Value"]
+    variables_changed = Signal()
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.variables = None
+        #rows keep the display order and hold names that are not in the dict yet (blank new rows)
+        self.rows: list[list[str]] = []
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 2
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            return None
+        return self.rows[index.row()][index.column()]
+    
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole or self.variables is None:
+            return False
+        row = self.rows[index.row()]
+        if index.column() == 0:
+            #a renamed variable drops its old name
+            if row[0]:
+                self.variables.pop(row[0], None)
+            row[0] = value
+        else:
+            row[1] = value
+        if row[0]:
+            self.variables[row[0]] = row[1]
+        self.dataChanged.emit(index, index, [role])
+        self.variables_changed.emit()
+        return True
+    
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        return _EDITABLE_FLAGS
+    
+    def set_variables(self, variables):
+        self.beginResetModel()
+        self.variables = variables
+        self.rows = [[key, value] for key, value in variables.items()] if variables is not None else []
+        self.endResetModel()
+    
+    def append_row(self):
+        row = len(self.rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.rows.append(["", ""])
+        self.endInsertRows()
+    
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if parent.isValid() or row < 0 or row + count > len(self.rows):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        for key, _ in self.rows[row:row + count]:
+            if key and self.variables is not None:
+                self.variables.pop(key, None)
+        del self.rows[row:row + count]
+        self.endRemoveRows()
+        self.variables_changed.emit()
+        return True
+
+
+class MultipartModel(QAbstractTableModel):
+    """Enabled / key / type / value rows backed by a plain list of MultipartItem."""
+    
+    HEADERS = ["Enabled", "Key", "Type", "Value"]
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.rows: list[MultipartItem] = []
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.rows)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 4
+    
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation == Qt.Orientation.Horizontal and role == Qt.ItemDataRole.DisplayRole:
+            return self.HEADERS[section]
+        return None
+    
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        item = self.rows[index.row()]
+        column = index.column()
+        if column == 0:
+            if role == Qt.ItemDataRole.CheckStateRole:
+                return Qt.CheckState.Checked if item.enabled else Qt.CheckState.Unchecked
+            return None
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            if column == 1:
+                return item.key
+            return item.type if column == 2 else item.value
+        return None
+    
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid():
+            return False
+        item = self.rows[index.row()]
+        column = index.column()
+        if column == 0 and role == Qt.ItemDataRole.CheckStateRole:
+            item.enabled = Qt.CheckState(value) == Qt.CheckState.Checked
+        elif column == 1 and role == Qt.ItemDataRole.EditRole:
+            item.key = value
+        elif column == 2 and role == Qt.ItemDataRole.EditRole:
+            item.type = value
+        elif column == 3 and role == Qt.ItemDataRole.EditRole:
+            item.value = value
+        else:
+            return False
+        self.dataChanged.emit(index, index, [role])
+        return True
+    
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        if index.column() == 0:
+            return _CHECKBOX_FLAGS
+        return _EDITABLE_FLAGS
+    
+    def set_rows(self, rows: list[MultipartItem]):
+        self.beginResetModel()
+        self.rows = rows
+        self.endResetModel()
+    
+    def append_row(self, item: MultipartItem):
+        row = len(self.rows)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self.rows.append(item)
+        self.endInsertRows()
+    
+    def removeRows(self, row, count, parent=QModelIndex()):
+        if parent.isValid() or row < 0 or row + count > len(self.rows):
+            return False
+        self.beginRemoveRows(parent, row, row + count - 1)
+        del self.rows[row:row + count]
+        self.endRemoveRows()
+        return True
+
+
+class MultipartTypeDelegate(QStyledItemDelegate):
+    """Text / file picker for the type column, only created while a cell is being edited."""
+    
+    TYPES = ["text", "file"]
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        #every editor shares one list model instead of building its own items
+        self.types_model = QStringListModel(self.TYPES, self)
+    
+    def createEditor(self, parent, option, index):
+        combo = QComboBox(parent)
+        combo.setModel(self.types_model)
+        return combo
+    
+    def setEditorData(self, editor, index):
+        editor.setCurrentText(index.data(Qt.ItemDataRole.EditRole))
+    
+    def setModelData(self, editor, model, index):
+        model.setData(index, editor.currentText(), Qt.ItemDataRole.EditRole)
+
+
+class KeyValueTable(QTableView):
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.kv_model = KeyValueModel(self)
+        self.setModel(self.kv_model)
+        set_fixed_sections(self)
         self.horizontalHeader().setStretchLastSection(True)
         self.setColumnWidth(0, 70)
         self.verticalHeader().setVisible(False)
@@ -184,54 +754,24 @@ class KeyValueTable(QTableWidget):
         
         #make column dividers more visible
 
-        self.horizontalHeader().setStyleSheet("""
-            QHeaderView::section {
-                border-right: 2px solid palette(mid);
-                background-color: palette(alternateBase);
-            }
-            QHeaderView::section:first {
-                border-right: 3px solid palette(dark);
-            }
-        """)
+        self.horizontalHeader().setStyleSheet(_CHECK_TABLE_HEADER_QSS)
     
     def add_row(self, key: str = "", value: str = "", enabled: bool = True):
-        row = self.rowCount()
-        self.insertRow(row)
-        
-        enabled_item = QTableWidgetItem()
-        enabled_item.setCheckState(Qt.CheckState.Checked if enabled else Qt.CheckState.Unchecked)
-        #make enabled column non-editable (only checkbox can be toggled)
-        enabled_item.setFlags(enabled_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-        self.setItem(row, 0, enabled_item)
-        
-        self.setItem(row, 1, QTableWidgetItem(key))
-        self.setItem(row, 2, QTableWidgetItem(value))
+        self.kv_model.append_row(KeyValuePair(enabled=enabled, key=key, value=value))
     
     def get_data(self) -> list[KeyValuePair]:
-        pairs = []
-        for row in range(self.rowCount()):
-            enabled_item = self.item(row, 0)
-            key_item = self.item(row, 1)
-            value_item = self.item(row, 2)
-            
-            enabled = enabled_item.checkState() == Qt.CheckState.Checked if enabled_item else True
-            key = key_item.text() if key_item else ""
-            value = value_item.text() if value_item else ""
-            
-            if key or value:
-                pairs.append(KeyValuePair(enabled=enabled, key=key, value=value))
-        
-        return pairs
+        #copies, so editing the table later never reaches into a request that was already sent or saved
+        return [
+            KeyValuePair(enabled=pair.enabled, key=pair.key, value=pair.value)
+            for pair in self.kv_model.rows
+            if pair.key or pair.value
+        ]
     
     def set_data(self, pairs: list[KeyValuePair]):
-        self.setRowCount(0)
-        for pair in pairs:
-            self.add_row(pair.key, pair.value, pair.enabled)
+        self.kv_model.set_rows([KeyValuePair(enabled=pair.enabled, key=pair.key, value=pair.value) for pair in pairs])
     
     def remove_selected_rows(self):
-        rows = sorted(set(item.row() for item in self.selectedItems()), reverse=True)
-        for row in rows:
-            self.removeRow(row)
+        remove_selected_table_rows(self)
 
 
 class MainWindow(QMainWindow):
@@ -244,7 +784,44 @@ class MainWindow(QMainWindow):
         self.collections_widget = collections_widget
         self.current_request = RequestModel()
         self.current_response = None
-        self.request_worker = None
+        self.request_signals = None
+        self.request_cancel = None
+        self.sidebar_loaded = False
+        #bumped per send, results from any older send are dropped
+        self.request_generation = 0
+        #writes and clears that happen before the sidebar files are read, settled in on_sidebar_data_loaded
+        self.collections_dirty = False
+        self.history_cleared_during_load = False
+        self.history_widget.history_cleared.connect(self.on_history_cleared)
+        self.response_generation = 0
+        
+        #requests run on a pool of their own, bounded by the settings, so other background work never queues behind them
+        
+        self.request_pool = QThreadPool(self)
+        self.request_pool.setMaxThreadCount(max(1, settings.max_concurrent_requests))
+        #keep-alive connections live as long as the window, the session itself is built on the first send
+        self.http_sessions = SessionCache()
+        self.clipboard = QGuiApplication.clipboard()
+        
+        #env table edits land in the environment right away, the save to disk is coalesced
+        
+        self.env_save_timer = QTimer(self)
+        self.env_save_timer.setSingleShot(True)
+        self.env_save_timer.setInterval(500)
+        self.env_save_timer.timeout.connect(self.save_environments)
+        
+        #new history entries are appended to disk in batches
+        
+        self.pending_history = []
+        self.history_save_timer = QTimer(self)
+        self.history_save_timer.setSingleShot(True)
+        self.history_save_timer.setInterval(2000)
+        self.history_save_timer.timeout.connect(self.save_pending_history)
+        
+        #one writer thread, so saves of the same file never overlap and keep their order
+        
+        self.save_pool = QThreadPool(self)
+        self.save_pool.setMaxThreadCount(1)
         
         self.init_ui()
         self.setup_shortcuts()
@@ -256,7 +833,6 @@ class MainWindow(QMainWindow):
         
         #set window icon
 
-        from pathlib import Path
         icon_path = Path(__file__).parent.parent / "favicon.png"
         if icon_path.exists():
             self.setWindowIcon(QIcon(str(icon_path)))
@@ -375,82 +951,12 @@ class MainWindow(QMainWindow):
         self.body_form_radio.toggled.connect(self.on_body_type_changed)
         self.body_multipart_radio.toggled.connect(self.on_body_type_changed)
         
-        #raw body
+        #raw, form and multipart editors are built the first time their body type is picked
 
-        self.raw_body_widget = QWidget()
-        raw_body_layout = QVBoxLayout(self.raw_body_widget)
-        raw_type_layout = QHBoxLayout()
-        raw_type_layout.addWidget(QLabel("Type:"))
-        self.raw_type_combo = QComboBox()
-        self.raw_type_combo.addItems([t.value for t in RawBodyType])
-        raw_type_layout.addWidget(self.raw_type_combo)
-        raw_type_layout.addStretch()
-        self.pretty_json_btn = QPushButton("Pretty Print JSON")
-        self.pretty_json_btn.clicked.connect(self.pretty_print_json)
-        raw_type_layout.addWidget(self.pretty_json_btn)
-        raw_body_layout.addLayout(raw_type_layout)
-        self.raw_body_edit = QPlainTextEdit()
-        self.raw_body_edit.setPlaceholderText("Enter request body...")
-        raw_body_layout.addWidget(self.raw_body_edit)
-        body_layout.addWidget(self.raw_body_widget)
-        self.raw_body_widget.setVisible(False)
-        
-        #form body
-
-        self.form_body_widget = QWidget()
-        form_body_layout = QVBoxLayout(self.form_body_widget)
-        self.form_table = KeyValueTable()
-        form_body_layout.addWidget(self.form_table)
-        form_buttons = QHBoxLayout()
-        add_form_btn = QPushButton("Add")
-        add_form_btn.clicked.connect(lambda: self.form_table.add_row())
-        remove_form_btn = QPushButton("Remove")
-        remove_form_btn.clicked.connect(self.form_table.remove_selected_rows)
-        form_buttons.addWidget(add_form_btn)
-        form_buttons.addWidget(remove_form_btn)
-        form_buttons.addStretch()
-        form_body_layout.addLayout(form_buttons)
-        body_layout.addWidget(self.form_body_widget)
-        self.form_body_widget.setVisible(False)
-        
-        #multipart body
-
-        self.multipart_body_widget = QWidget()
-        multipart_body_layout = QVBoxLayout(self.multipart_body_widget)
-        self.multipart_table = QTableWidget()
-        self.multipart_table.setColumnCount(4)
-        self.multipart_table.setHorizontalHeaderLabels(["Enabled", "Key", "Type", "Value"])
-        self.multipart_table.horizontalHeader().setStretchLastSection(True)
-        self.multipart_table.setColumnWidth(0, 70)
-        self.multipart_table.setColumnWidth(2, 100)
-        self.multipart_table.setShowGrid(True)
-        self.multipart_table.setGridStyle(Qt.PenStyle.SolidLine)
-        self.multipart_table.setAlternatingRowColors(True)
-        self.multipart_table.verticalHeader().setVisible(False)
-        
-        #make column dividers more visible
-
-        self.multipart_table.horizontalHeader().setStyleSheet("""
-            QHeaderView::section {
-                border-right: 2px solid palette(mid);
-                background-color: palette(alternateBase);
-            }
-            QHeaderView::section:first {
-                border-right: 3px solid palette(dark);
-            }
-        """)
-        multipart_body_layout.addWidget(self.multipart_table)
-        multipart_buttons = QHBoxLayout()
-        add_multipart_btn = QPushButton("Add")
-        add_multipart_btn.clicked.connect(self.add_multipart_row)
-        remove_multipart_btn = QPushButton("Remove")
-        remove_multipart_btn.clicked.connect(self.remove_multipart_rows)
-        multipart_buttons.addWidget(add_multipart_btn)
-        multipart_buttons.addWidget(remove_multipart_btn)
-        multipart_buttons.addStretch()
-        multipart_body_layout.addLayout(multipart_buttons)
-        body_layout.addWidget(self.multipart_body_widget)
-        self.multipart_body_widget.setVisible(False)
+        self.body_layout = body_layout
+        self.raw_body_widget = None
+        self.form_body_widget = None
+        self.multipart_body_widget = None
         
         self.request_tabs.addTab(body_widget, "Body")
         
@@ -479,22 +985,11 @@ class MainWindow(QMainWindow):
         self.auth_basic_radio.toggled.connect(self.on_auth_type_changed)
         self.auth_bearer_radio.toggled.connect(self.on_auth_type_changed)
         
-        self.basic_auth_widget = QWidget()
-        basic_auth_layout = QFormLayout(self.basic_auth_widget)
-        self.username_edit = QLineEdit()
-        self.password_edit = QLineEdit()
-        self.password_edit.setEchoMode(QLineEdit.EchoMode.Password)
-        basic_auth_layout.addRow("Username:", self.username_edit)
-        basic_auth_layout.addRow("Password:", self.password_edit)
-        auth_layout.addWidget(self.basic_auth_widget)
-        self.basic_auth_widget.setVisible(False)
-        
-        self.bearer_auth_widget = QWidget()
-        bearer_auth_layout = QFormLayout(self.bearer_auth_widget)
-        self.bearer_token_edit = QLineEdit()
-        bearer_auth_layout.addRow("Token:", self.bearer_token_edit)
-        auth_layout.addWidget(self.bearer_auth_widget)
-        self.bearer_auth_widget.setVisible(False)
+        #credential fields are built the first time their auth type is picked
+
+        self.auth_layout = auth_layout
+        self.basic_auth_widget = None
+        self.bearer_auth_widget = None
         
         self.request_tabs.addTab(auth_widget, "Auth")
         
@@ -511,24 +1006,20 @@ class MainWindow(QMainWindow):
         env_select_layout.addStretch()
         env_layout.addLayout(env_select_layout)
         
-        self.env_table = QTableWidget()
-        self.env_table.setColumnCount(2)
-        self.env_table.setHorizontalHeaderLabels(["Name", "Value"])
+        self.env_model = EnvVarsModel(self)
+        self.env_model.variables_changed.connect(self.env_save_timer.start)
+        self.env_table = QTableView()
+        self.env_table.setModel(self.env_model)
+        set_fixed_sections(self.env_table)
         self.env_table.horizontalHeader().setStretchLastSection(True)
         self.env_table.setShowGrid(True)
         self.env_table.setGridStyle(Qt.PenStyle.SolidLine)
         self.env_table.setAlternatingRowColors(True)
         self.env_table.verticalHeader().setVisible(False)
-        self.env_table.itemChanged.connect(self.on_env_table_changed)
         
         #make column dividers more visible
 
-        self.env_table.horizontalHeader().setStyleSheet("""
-            QHeaderView::section {
-                border-right: 2px solid palette(mid);
-                background-color: palette(alternateBase);
-            }
-        """)
+        self.env_table.horizontalHeader().setStyleSheet(_TABLE_HEADER_QSS)
         env_layout.addWidget(self.env_table)
         
         env_buttons = QHBoxLayout()
@@ -553,13 +1044,11 @@ class MainWindow(QMainWindow):
         
         #response summary
 
+        #one label for status, time and size, so a response costs one setText and one relayout
         summary_layout = QHBoxLayout()
-        self.status_label = QLabel("Status: -")
-        self.time_label = QLabel("Time: -")
-        self.size_label = QLabel("Size: -")
-        summary_layout.addWidget(self.status_label)
-        summary_layout.addWidget(self.time_label)
-        summary_layout.addWidget(self.size_label)
+        self.summary_label = QLabel(_EMPTY_SUMMARY)
+        self.summary_label.setTextFormat(Qt.TextFormat.PlainText)
+        summary_layout.addWidget(self.summary_label)
         summary_layout.addStretch()
         response_layout.addLayout(summary_layout)
         
@@ -573,12 +1062,17 @@ class MainWindow(QMainWindow):
         body_response_layout = QVBoxLayout(body_response_widget)
         self.response_body_edit = QPlainTextEdit()
         self.response_body_edit.setReadOnly(True)
+        #long unbroken lines (minified bodies) are far cheaper to lay out without wrapping
+        self.response_body_edit.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
         self.json_highlighter = JsonHighlighter(self.response_body_edit.document())
         body_response_layout.addWidget(self.response_body_edit)
         body_response_buttons = QHBoxLayout()
         copy_body_btn = QPushButton("Copy Body")
         copy_body_btn.clicked.connect(self.copy_response_body)
         body_response_buttons.addWidget(copy_body_btn)
+        save_body_btn = QPushButton("Save Body As…")
+        save_body_btn.clicked.connect(self.save_response_body)
+        body_response_buttons.addWidget(save_body_btn)
         body_response_buttons.addStretch()
         body_response_layout.addLayout(body_response_buttons)
         self.response_tabs.addTab(body_response_widget, "Body")
@@ -587,9 +1081,10 @@ class MainWindow(QMainWindow):
 
         headers_response_widget = QWidget()
         headers_response_layout = QVBoxLayout(headers_response_widget)
-        self.response_headers_table = QTableWidget()
-        self.response_headers_table.setColumnCount(2)
-        self.response_headers_table.setHorizontalHeaderLabels(["Key", "Value"])
+        self.response_headers_model = HeadersModel(self)
+        self.response_headers_table = QTableView()
+        self.response_headers_table.setModel(self.response_headers_model)
+        set_fixed_sections(self.response_headers_table)
         self.response_headers_table.horizontalHeader().setStretchLastSection(True)
         self.response_headers_table.setShowGrid(True)
         self.response_headers_table.setGridStyle(Qt.PenStyle.SolidLine)
@@ -598,17 +1093,15 @@ class MainWindow(QMainWindow):
         
         #make column dividers more visible
 
-        self.response_headers_table.horizontalHeader().setStyleSheet("""
-            QHeaderView::section {
-                border-right: 2px solid palette(mid);
-                background-color: palette(alternateBase);
-            }
-        """)
+        self.response_headers_table.horizontalHeader().setStyleSheet(_TABLE_HEADER_QSS)
         headers_response_layout.addWidget(self.response_headers_table)
         headers_response_buttons = QHBoxLayout()
         copy_headers_btn = QPushButton("Copy Headers")
         copy_headers_btn.clicked.connect(self.copy_response_headers)
         headers_response_buttons.addWidget(copy_headers_btn)
+        fit_columns_btn = QPushButton("Fit Columns")
+        fit_columns_btn.clicked.connect(self.response_headers_table.resizeColumnsToContents)
+        headers_response_buttons.addWidget(fit_columns_btn)
         headers_response_buttons.addStretch()
         headers_response_layout.addLayout(headers_response_buttons)
         self.response_tabs.addTab(headers_response_widget, "Headers")
@@ -618,6 +1111,7 @@ class MainWindow(QMainWindow):
         raw_response_layout = QVBoxLayout(raw_response_widget)
         self.response_raw_edit = QPlainTextEdit()
         self.response_raw_edit.setReadOnly(True)
+        self.response_raw_edit.setLineWrapMode(QPlainTextEdit.LineWrapMode.NoWrap)
         raw_response_layout.addWidget(self.response_raw_edit)
         self.response_tabs.addTab(raw_response_widget, "Raw")
         
@@ -645,55 +1139,9 @@ class MainWindow(QMainWindow):
         except:
             pass
         
-        #store menu style for reuse
-
-        self.menu_style = """
-            QMenu {
-                background-color: #353535;
-                color: #ffffff;
-                border: 1px solid #555555;
-            }
-            QMenu::item {
-                background-color: transparent;
-                color: #ffffff;
-                padding: 6px 32px 6px 8px;
-            }
-            QMenu::item:selected {
-                background-color: #2a82da;
-                color: #ffffff;
-            }
-            QMenu::item:disabled {
-                color: #888888;
-            }
-            QMenu::separator {
-                height: 1px;
-                background-color: #555555;
-                margin: 4px 0px;
-            }
-        """
-        
         #apply explicit styling to menu bar for dark theme
 
-        menubar.setStyleSheet("""
-            QMenuBar {
-                background-color: #353535;
-                color: #ffffff;
-                border-bottom: 1px solid #555555;
-            }
-            QMenuBar::item {
-                background-color: transparent;
-                color: #ffffff;
-                padding: 4px 8px;
-            }
-            QMenuBar::item:selected {
-                background-color: #454545;
-                color: #ffffff;
-            }
-            QMenuBar::item:pressed {
-                background-color: #2a82da;
-                color: #ffffff;
-            }
-        """)
+        menubar.setStyleSheet(_MENUBAR_QSS)
         
         #file menu
 
@@ -736,10 +1184,10 @@ class MainWindow(QMainWindow):
         
         #apply menu styling to each menu individually for dark theme
 
-        file_menu.setStyleSheet(self.menu_style)
-        edit_menu.setStyleSheet(self.menu_style)
-        tools_menu.setStyleSheet(self.menu_style)
-        help_menu.setStyleSheet(self.menu_style)
+        file_menu.setStyleSheet(_MENU_QSS)
+        edit_menu.setStyleSheet(_MENU_QSS)
+        tools_menu.setStyleSheet(_MENU_QSS)
+        help_menu.setStyleSheet(_MENU_QSS)
     
     def setup_shortcuts(self):
         #ctrl+enter to send
@@ -763,121 +1211,202 @@ class MainWindow(QMainWindow):
         self.update_env_table()
     
     def update_env_table(self):
-        env_name = self.env_combo.currentText()
-        env = self.environments.get(env_name, None)
-        if not env:
-            self.env_table.setRowCount(0)
-            return
-        
-        #temporarily disconnect signal to avoid recursion
-
-        try:
-            self.env_table.itemChanged.disconnect(self.on_env_table_changed)
-        except:
-            pass
-        
-        self.env_table.setRowCount(len(env.variables))
-        for row, (key, value) in enumerate(env.variables.items()):
-            self.env_table.setItem(row, 0, QTableWidgetItem(key))
-            self.env_table.setItem(row, 1, QTableWidgetItem(value))
-        
-        #reconnect signal
-
-        self.env_table.itemChanged.connect(self.on_env_table_changed)
+        env = self.environments.get(self.env_combo.currentText())
+        self.env_model.set_variables(env.variables if env else None)
+    
+    def save_environments(self):
+        self.env_save_timer.stop()
+        #the writer gets its own copy, the env table keeps editing the live dicts
+        snapshot = {
+            name: Environment(name=env.name, variables=dict(env.variables))
+            for name, env in self.environments.items()
+        }
+        self.save_pool.start(SaveWorker(save_environments, snapshot))
     
-    def on_env_table_changed(self, item: QTableWidgetItem):
-        env_name = self.env_combo.currentText()
-        env = self.environments.get(env_name)
-        if not env:
+    def save_pending_history(self):
+        self.history_save_timer.stop()
+        if not self.pending_history:
             return
-        
-        row = item.row()
-        key_item = self.env_table.item(row, 0)
-        value_item = self.env_table.item(row, 1)
-        
-        if key_item and value_item:
-            key = key_item.text()
-            value = value_item.text()
-            if key:
-                env.variables[key] = value
-        
-        #save environments
-
-        from .persistence import save_environments
-        save_environments(self.environments)
+        entries, self.pending_history = self.pending_history, []
+        self.save_pool.start(SaveWorker(add_history_entries, entries))
+    
+    def flush_pending_saves(self):
+        #called before the exit saves, so nothing queued here lands after them
+        if self.env_save_timer.isActive():
+            self.save_environments()
+        self.save_pending_history()
+        self.save_pool.waitForDone()
     
     def add_env_var(self):
-        env_name = self.env_combo.currentText()
-        env = self.environments.get(env_name)
-        if not env:
+        if self.env_model.variables is None:
             return
-        
-        row = self.env_table.rowCount()
-        self.env_table.insertRow(row)
-        self.env_table.setItem(row, 0, QTableWidgetItem(""))
-        self.env_table.setItem(row, 1, QTableWidgetItem(""))
+        self.env_model.append_row()
     
     def remove_env_var(self):
-        rows = sorted(set(item.row() for item in self.env_table.selectedItems()), reverse=True)
-        env_name = self.env_combo.currentText()
-        env = self.environments.get(env_name)
-        if not env:
-            return
+        remove_selected_table_rows(self.env_table)
+    
+    def on_sidebar_data_loaded(self, history_entries: list, collections: list):
+        #keep anything added while the files were still being read
+        
+        current = self.history_widget.get_all_entries()
+        if self.history_cleared_during_load:
+            #the clear covers what was on disk too
+            history_entries = []
+        #entries the history timer already flushed are in the file as well as in the list
+        seen = {(entry.timestamp, entry.method, entry.url) for entry in current}
+        self.history_widget.load_history(
+            current + [entry for entry in history_entries if (entry.timestamp, entry.method, entry.url) not in seen]
+        )
         
-        for row in rows:
-            key_item = self.env_table.item(row, 0)
-            if key_item:
-                key = key_item.text()
-                if key in env.variables:
-                    del env.variables[key]
-            self.env_table.removeRow(row)
+        #collections made during the load join the file's list, same names share one collection
+        
+        by_name = {coll.name: coll for coll in collections}
+        for coll in self.collections_widget.get_all_collections():
+            loaded = by_name.get(coll.name)
+            if loaded is None:
+                collections.append(coll)
+                by_name[coll.name] = coll
+            else:
+                loaded.items.extend(coll.items)
+        self.collections_widget.load_collections(collections)
+        self.sidebar_loaded = True
+        
+        if self.collections_dirty:
+            self.collections_dirty = False
+            save_collections(collections)
+    
+    def on_history_cleared(self):
+        if not self.sidebar_loaded:
+            self.history_cleared_during_load = True
+    
+    def save_collections_when_loaded(self):
+        #before the file is read, saving would replace it with only what exists so far
+        if self.sidebar_loaded:
+            save_collections(self.collections_widget.get_all_collections())
+        else:
+            self.collections_dirty = True
+    
+    def create_raw_body_widget(self):
+        self.raw_body_widget = QWidget()
+        raw_body_layout = QVBoxLayout(self.raw_body_widget)
+        raw_type_layout = QHBoxLayout()
+        raw_type_layout.addWidget(QLabel("Type:"))
+        self.raw_type_combo = QComboBox()
+        self.raw_type_combo.addItems([t.value for t in RawBodyType])
+        raw_type_layout.addWidget(self.raw_type_combo)
+        raw_type_layout.addStretch()
+        self.pretty_json_btn = QPushButton("Pretty Print JSON")
+        self.pretty_json_btn.clicked.connect(self.format_raw_body_json)
+        raw_type_layout.addWidget(self.pretty_json_btn)
+        raw_body_layout.addLayout(raw_type_layout)
+        self.raw_body_edit = QPlainTextEdit()
+        self.raw_body_edit.setPlaceholderText("Enter request body...")
+        raw_body_layout.addWidget(self.raw_body_edit)
+        self.body_layout.addWidget(self.raw_body_widget)
+    
+    def create_form_body_widget(self):
+        self.form_body_widget = QWidget()
+        form_body_layout = QVBoxLayout(self.form_body_widget)
+        self.form_table = KeyValueTable()
+        form_body_layout.addWidget(self.form_table)
+        form_buttons = QHBoxLayout()
+        add_form_btn = QPushButton("Add")
+        add_form_btn.clicked.connect(lambda: self.form_table.add_row())
+        remove_form_btn = QPushButton("Remove")
+        remove_form_btn.clicked.connect(self.form_table.remove_selected_rows)
+        form_buttons.addWidget(add_form_btn)
+        form_buttons.addWidget(remove_form_btn)
+        form_buttons.addStretch()
+        form_body_layout.addLayout(form_buttons)
+        self.body_layout.addWidget(self.form_body_widget)
+    
+    def create_multipart_body_widget(self):
+        self.multipart_body_widget = QWidget()
+        multipart_body_layout = QVBoxLayout(self.multipart_body_widget)
+        self.multipart_model = MultipartModel(self)
+        self.multipart_table = QTableView()
+        self.multipart_table.setModel(self.multipart_model)
+        set_fixed_sections(self.multipart_table)
+        self.multipart_table.setItemDelegateForColumn(2, MultipartTypeDelegate(self.multipart_table))
+        self.multipart_table.horizontalHeader().setStretchLastSection(True)
+        self.multipart_table.setColumnWidth(0, 70)
+        self.multipart_table.setColumnWidth(2, 100)
+        self.multipart_table.setShowGrid(True)
+        self.multipart_table.setGridStyle(Qt.PenStyle.SolidLine)
+        self.multipart_table.setAlternatingRowColors(True)
+        self.multipart_table.verticalHeader().setVisible(False)
         
-        self.update_env_table()
-        from .persistence import save_environments
-        save_environments(self.environments)
+        #make column dividers more visible
+
+        self.multipart_table.horizontalHeader().setStyleSheet(_CHECK_TABLE_HEADER_QSS)
+        multipart_body_layout.addWidget(self.multipart_table)
+        multipart_buttons = QHBoxLayout()
+        add_multipart_btn = QPushButton("Add")
+        add_multipart_btn.clicked.connect(self.add_multipart_row)
+        remove_multipart_btn = QPushButton("Remove")
+        remove_multipart_btn.clicked.connect(self.remove_multipart_rows)
+        multipart_buttons.addWidget(add_multipart_btn)
+        multipart_buttons.addWidget(remove_multipart_btn)
+        multipart_buttons.addStretch()
+        multipart_body_layout.addLayout(multipart_buttons)
+        self.body_layout.addWidget(self.multipart_body_widget)
+    
+    def create_basic_auth_widget(self):
+        self.basic_auth_widget = QWidget()
+        basic_auth_layout = QFormLayout(self.basic_auth_widget)
+        self.username_edit = QLineEdit()
+        self.password_edit = QLineEdit()
+        self.password_edit.setEchoMode(QLineEdit.EchoMode.Password)
+        basic_auth_layout.addRow("Username:", self.username_edit)
+        basic_auth_layout.addRow("Password:", self.password_edit)
+        self.auth_layout.addWidget(self.basic_auth_widget)
+    
+    def create_bearer_auth_widget(self):
+        self.bearer_auth_widget = QWidget()
+        bearer_auth_layout = QFormLayout(self.bearer_auth_widget)
+        self.bearer_token_edit = QLineEdit()
+        bearer_auth_layout.addRow("Token:", self.bearer_token_edit)
+        self.auth_layout.addWidget(self.bearer_auth_widget)
     
     def on_body_type_changed(self):
-        self.raw_body_widget.setVisible(self.body_raw_radio.isChecked())
-        self.form_body_widget.setVisible(self.body_form_radio.isChecked())
-        self.multipart_body_widget.setVisible(self.body_multipart_radio.isChecked())
+        if self.body_raw_radio.isChecked() and self.raw_body_widget is None:
+            self.create_raw_body_widget()
+        elif self.body_form_radio.isChecked() and self.form_body_widget is None:
+            self.create_form_body_widget()
+        elif self.body_multipart_radio.isChecked() and self.multipart_body_widget is None:
+            self.create_multipart_body_widget()
+        
+        if self.raw_body_widget is not None:
+            self.raw_body_widget.setVisible(self.body_raw_radio.isChecked())
+        if self.form_body_widget is not None:
+            self.form_body_widget.setVisible(self.body_form_radio.isChecked())
+        if self.multipart_body_widget is not None:
+            self.multipart_body_widget.setVisible(self.body_multipart_radio.isChecked())
     
     def on_auth_type_changed(self):
-        self.basic_auth_widget.setVisible(self.auth_basic_radio.isChecked())
-        self.bearer_auth_widget.setVisible(self.auth_bearer_radio.isChecked())
+        if self.auth_basic_radio.isChecked() and self.basic_auth_widget is None:
+            self.create_basic_auth_widget()
+        elif self.auth_bearer_radio.isChecked() and self.bearer_auth_widget is None:
+            self.create_bearer_auth_widget()
+        
+        if self.basic_auth_widget is not None:
+            self.basic_auth_widget.setVisible(self.auth_basic_radio.isChecked())
+        if self.bearer_auth_widget is not None:
+            self.bearer_auth_widget.setVisible(self.auth_bearer_radio.isChecked())
     
     def add_multipart_row(self):
-        row = self.multipart_table.rowCount()
-        self.multipart_table.insertRow(row)
-        
-        enabled_item = QTableWidgetItem()
-        enabled_item.setCheckState(Qt.CheckState.Checked)
-        #make enabled column non-editable (only checkbox can be toggled)
-        enabled_item.setFlags(enabled_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-        self.multipart_table.setItem(row, 0, enabled_item)
-        
-        self.multipart_table.setItem(row, 1, QTableWidgetItem(""))
-        
-        type_combo = QComboBox()
-        type_combo.addItems(["text", "file"])
-        self.multipart_table.setCellWidget(row, 2, type_combo)
-        
-        value_item = QTableWidgetItem("")
-        self.multipart_table.setItem(row, 3, value_item)
+        self.multipart_model.append_row(MultipartItem())
     
     def remove_multipart_rows(self):
-        rows = sorted(set(item.row() for item in self.multipart_table.selectedItems()), reverse=True)
-        for row in rows:
-            self.multipart_table.removeRow(row)
+        remove_selected_table_rows(self.multipart_table)
     
-    def pretty_print_json(self):
-        text = self.raw_body_edit.toPlainText()
+    def format_raw_body_json(self):
         try:
-            import json
-            obj = json.loads(text)
-            pretty = json.dumps(obj, indent=2)
-            self.raw_body_edit.setPlainText(pretty)
-        except json.JSONDecodeError:
+            pretty = pretty_print_json(self.raw_body_edit.toPlainText())
+        except (ValueError, RecursionError):
             QMessageBox.warning(self, "Invalid JSON", "The text is not valid JSON.")
+            return
+        self.raw_body_edit.setPlainText(pretty)
     
     def get_request_model(self) -> RequestModel:
         request = RequestModel()
@@ -888,7 +1417,7 @@ class MainWindow(QMainWindow):
         #strip quotes from url if present
         url = self.url_edit.text().strip()
         #remove surrounding quotes (single or double)
-        if (url.startswith('"') and url.endswith('"')) or (url.startswith("'") and url.endswith("'")):
+        if len(url) >= 2 and url[0] == url[-1] and url[0] in "\"'":
             url = url[1:-1]
         request.url = url
         
@@ -913,22 +1442,11 @@ class MainWindow(QMainWindow):
             request.form_data = self.form_table.get_data()
         elif self.body_multipart_radio.isChecked():
             request.body_type = BodyType.MULTIPART
-            request.multipart_data = []
-            for row in range(self.multipart_table.rowCount()):
-                enabled_item = self.multipart_table.item(row, 0)
-                key_item = self.multipart_table.item(row, 1)
-                type_widget = self.multipart_table.cellWidget(row, 2)
-                value_item = self.multipart_table.item(row, 3)
-                
-                enabled = enabled_item.checkState() == Qt.CheckState.Checked if enabled_item else True
-                key = key_item.text() if key_item else ""
-                item_type = type_widget.currentText() if type_widget else "text"
-                value = value_item.text() if value_item else ""
-                
-                if key or value:
-                    request.multipart_data.append(
-                        MultipartItem(enabled=enabled, key=key, type=item_type, value=value)
-                    )
+            request.multipart_data = [
+                MultipartItem(enabled=item.enabled, key=item.key, type=item.type, value=item.value)
+                for item in self.multipart_model.rows
+                if item.key or item.value
+            ]
         
         #auth
 
@@ -968,49 +1486,48 @@ class MainWindow(QMainWindow):
 
         self.headers_table.set_data(request.headers)
         
-        #body
-
-        if request.body_type == BodyType.NONE:
-            self.body_none_radio.setChecked(True)
-        elif request.body_type == BodyType.RAW:
-            self.body_raw_radio.setChecked(True)
+        #body, switching radios fires toggled on both the old and the new one, lay out once instead
+
+        body_radios = {
+            BodyType.NONE: self.body_none_radio,
+            BodyType.RAW: self.body_raw_radio,
+            BodyType.FORM_URLENCODED: self.body_form_radio,
+            BodyType.MULTIPART: self.body_multipart_radio,
+        }
+        if request.body_type in body_radios:
+            with (QSignalBlocker(self.body_none_radio), QSignalBlocker(self.body_raw_radio),
+                  QSignalBlocker(self.body_form_radio), QSignalBlocker(self.body_multipart_radio)):
+                body_radios[request.body_type].setChecked(True)
+            self.on_body_type_changed()
+        
+        if request.body_type == BodyType.RAW:
             self.raw_type_combo.setCurrentText(request.raw_body_type.value)
             self.raw_body_edit.setPlainText(request.raw_body)
         elif request.body_type == BodyType.FORM_URLENCODED:
-            self.body_form_radio.setChecked(True)
             self.form_table.set_data(request.form_data)
         elif request.body_type == BodyType.MULTIPART:
-            self.body_multipart_radio.setChecked(True)
-            self.multipart_table.setRowCount(0)
-            for item in request.multipart_data:
-                row = self.multipart_table.rowCount()
-                self.multipart_table.insertRow(row)
-                
-                enabled_item = QTableWidgetItem()
-                enabled_item.setCheckState(Qt.CheckState.Checked if item.enabled else Qt.CheckState.Unchecked)
-                #make enabled column non-editable (only checkbox can be toggled)
-                enabled_item.setFlags(enabled_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                self.multipart_table.setItem(row, 0, enabled_item)
-                
-                self.multipart_table.setItem(row, 1, QTableWidgetItem(item.key))
-                
-                type_combo = QComboBox()
-                type_combo.addItems(["text", "file"])
-                type_combo.setCurrentText(item.type)
-                self.multipart_table.setCellWidget(row, 2, type_combo)
-                
-                self.multipart_table.setItem(row, 3, QTableWidgetItem(item.value))
-        
-        #auth
-
-        if request.auth.auth_type == AuthType.NONE:
-            self.auth_none_radio.setChecked(True)
-        elif request.auth.auth_type == AuthType.BASIC:
-            self.auth_basic_radio.setChecked(True)
+            self.multipart_model.set_rows([
+                MultipartItem(enabled=item.enabled, key=item.key, type=item.type, value=item.value)
+                for item in request.multipart_data
+            ])
+        
+        #auth, same single layout pass as the body
+
+        auth_radios = {
+            AuthType.NONE: self.auth_none_radio,
+            AuthType.BASIC: self.auth_basic_radio,
+            AuthType.BEARER: self.auth_bearer_radio,
+        }
+        if request.auth.auth_type in auth_radios:
+            with (QSignalBlocker(self.auth_none_radio), QSignalBlocker(self.auth_basic_radio),
+                  QSignalBlocker(self.auth_bearer_radio)):
+                auth_radios[request.auth.auth_type].setChecked(True)
+            self.on_auth_type_changed()
+        
+        if request.auth.auth_type == AuthType.BASIC:
             self.username_edit.setText(request.auth.username)
             self.password_edit.setText(request.auth.password)
         elif request.auth.auth_type == AuthType.BEARER:
-            self.auth_bearer_radio.setChecked(True)
             self.bearer_token_edit.setText(request.auth.bearer_token)
         
         #environment
@@ -1043,27 +1560,40 @@ class MainWindow(QMainWindow):
         
         #clear previous response
 
+        self.discard_response_file()
         self.current_response = None
+        self.response_generation += 1
         self.response_body_edit.clear()
-        self.response_headers_table.setRowCount(0)
+        self.response_headers_model.set_rows([])
         self.response_raw_edit.clear()
-        self.status_label.setText("Status: -")
-        self.time_label.setText("Time: -")
-        self.size_label.setText("Size: -")
+        self.summary_label.setText(_EMPTY_SUMMARY)
         
-        #start worker thread
+        #start worker on the request thread pool
 
-        if self.request_worker:
-            self.request_worker.terminate()
-            self.request_worker.wait()
+        #a previous request may still be running: ask it to stop reading and drop its result, never block on it
+        
+        if self.request_signals:
+            self.request_cancel.set()
+            self.request_signals.finished.disconnect(self.on_request_finished)
+            self.request_signals.error.disconnect(self.on_request_error)
         
-        self.request_worker = RequestWorker(request, self.settings, self.environments)
-        self.request_worker.finished.connect(self.on_request_finished)
-        self.request_worker.error.connect(self.on_request_error)
-        self.request_worker.start()
+        self.request_generation += 1
+        worker = RequestWorker(request, self.settings, self.environments, self.http_sessions, self.request_generation)
+        worker.signals.finished.connect(self.on_request_finished)
+        worker.signals.error.connect(self.on_request_error)
+        self.request_signals = worker.signals
+        self.request_cancel = worker.cancel_event
+        self.request_pool.start(worker)
     
-    def on_request_finished(self, response: ResponseModel):
+    def on_request_finished(self, response: ResponseModel, generation: int):
+        #a result already queued before its send was superseded, disconnecting does not recall it
+        if generation != self.request_generation:
+            if response.body_path:
+                Path(response.body_path).unlink(missing_ok=True)
+            return
+        self.discard_response_file()
         self.current_response = response
+        self.response_generation += 1
         
         #update status bar
 
@@ -1077,47 +1607,45 @@ class MainWindow(QMainWindow):
         
         #update summary
 
-        self.status_label.setText(f"Status: {response.status_code} {response.reason}")
-        self.time_label.setText(f"Time: {response.time_taken_ms:.2f} ms")
-        size_bytes = len(response.body_bytes)
-        if size_bytes < 1024:
-            size_str = f"{size_bytes} B"
-        elif size_bytes < 1024 * 1024:
-            size_str = f"{size_bytes / 1024:.2f} KB"
-        else:
-            size_str = f"{size_bytes / (1024 * 1024):.2f} MB"
-        self.size_label.setText(f"Size: {size_str}")
+        size_bytes = response.size
+        self.summary_label.setText(
+            f"Status: {response.status_code} {response.reason}    "
+            f"Time: {response.time_taken_ms:.2f} ms    "
+            f"Size: {format_size(size_bytes)}"
+        )
         
         #update body
 
-        body_text = response.body_text
-        #try to pretty print json
+        #json was already formatted by the worker, huge bodies are shown as received
+        body_text = response.body_pretty or response.body_text
+        status_note = ""
         content_type = response.headers.get("Content-Type", "").lower()
-        if "json" in content_type:
-            try:
-                import json
-                obj = json.loads(body_text)
-                body_text = json.dumps(obj, indent=2)
-            except:
-                pass
+        if response.body_path:
+            status_note = f" (showing the first {format_size(len(response.body_bytes))}, use Save Body As… for the full body)"
+        elif "json" in content_type and 0 < self.settings.max_pretty_bytes < size_bytes:
+            #with the limit at 0 formatting is simply off, nothing to explain
+            status_note = " (JSON not formatted, body too large)"
         
-        self.response_body_edit.setPlainText(body_text)
+        #detach while the text goes in, then reattach for a single full pass instead of per-block updates
+        #only small json bodies are worth highlighting, anything else would just burn time in highlightBlock
+        
+        self.json_highlighter.setDocument(None)
+        self.set_response_text(self.response_body_edit, body_text)
+        if "json" in content_type and size_bytes <= self.settings.max_highlight_bytes:
+            self.json_highlighter.setDocument(self.response_body_edit.document())
         
         #update headers
 
-        self.response_headers_table.setRowCount(len(response.headers))
-        for row, (key, value) in enumerate(response.headers.items()):
-            self.response_headers_table.setItem(row, 0, QTableWidgetItem(key))
-            self.response_headers_table.setItem(row, 1, QTableWidgetItem(value))
+        self.response_headers_model.set_rows(list(response.headers.items()))
         
         #update raw
 
-        raw_text = f"HTTP/1.1 {response.status_code} {response.reason}\n"
-        for key, value in response.headers.items():
-            raw_text += f"{key}: {value}\n"
-        raw_text += "\n"
-        raw_text += body_text
-        self.response_raw_edit.setPlainText(raw_text)
+        parts = [f"HTTP/1.1 {response.status_code} {response.reason}"]
+        parts.extend(f"{key}: {value}" for key, value in response.headers.items())
+        parts.append("")
+        parts.append(body_text)
+        raw_text = "\n".join(parts)
+        self.set_response_text(self.response_raw_edit, raw_text)
         
         #save to history
 
@@ -1130,18 +1658,39 @@ class MainWindow(QMainWindow):
             request=request
         )
         self.history_widget.add_entry(history_entry)
-        from .persistence import add_history_entry
-        add_history_entry(history_entry)
+        self.pending_history.append(history_entry)
+        if not self.history_save_timer.isActive():
+            self.history_save_timer.start()
         
-        self.status_bar.showMessage(f"Request completed: {response.status_code} {response.reason}")
+        self.status_bar.showMessage(f"Request completed: {response.status_code} {response.reason}{status_note}")
+    
+    def set_response_text(self, edit: QPlainTextEdit, text: str):
+        #the first chunk goes in right away, the rest follows without blocking the event loop
+        end = _chunk_end(text, 0)
+        edit.setPlainText(text[:end])
+        if end < len(text):
+            generation = self.response_generation
+            QTimer.singleShot(0, lambda: self.append_response_chunk(edit, text, end + 1, generation))
     
-    def on_request_error(self, error_msg: str):
+    def append_response_chunk(self, edit: QPlainTextEdit, text: str, start: int, generation: int):
+        #a newer response (or a new send) replaced this text, drop the rest
+        if generation != self.response_generation:
+            return
+        end = _chunk_end(text, start)
+        edit.appendPlainText(text[start:end])
+        if end < len(text):
+            QTimer.singleShot(0, lambda: self.append_response_chunk(edit, text, end + 1, generation))
+    
+    def on_request_error(self, error_msg: str, generation: int):
+        if generation != self.request_generation:
+            return
         self.send_button.setEnabled(True)
         self.send_button.setText("Send")
         self.status_bar.showMessage(f"Error: {error_msg}")
         QMessageBox.critical(self, "Request Error", error_msg)
     
     def show_curl_export(self):
+        from .curl_export import generate_curl_command
         request = self.get_request_model()
         curl_command = generate_curl_command(
             request,
@@ -1160,26 +1709,42 @@ class MainWindow(QMainWindow):
             self.status_bar.showMessage("cURL command imported successfully")
     
     def copy_response_body(self):
-        clipboard = QClipboard()
-        clipboard.setText(self.response_body_edit.toPlainText())
+        self.clipboard.setText(self.response_body_edit.toPlainText())
         self.status_bar.showMessage("Response body copied to clipboard")
     
+    def save_response_body(self):
+        response = self.current_response
+        if response is None or response.error:
+            return
+        file_path, _ = QFileDialog.getSaveFileName(self, "Save Response Body", "", "All Files (*)")
+        if file_path:
+            try:
+                #large bodies are already on disk, copy the file instead of loading it
+                if response.body_path:
+                    shutil.copyfile(response.body_path, file_path)
+                else:
+                    with open(file_path, "wb") as f:
+                        f.write(response.body_bytes)
+                self.status_bar.showMessage(f"Response body saved to {file_path}")
+            except Exception as e:
+                QMessageBox.critical(self, "Save Error", f"Failed to save response body:\n{str(e)}")
+    
+    def discard_response_file(self):
+        #a large body spilled to a temp file lives only as long as its response is shown
+        if self.current_response is not None and self.current_response.body_path:
+            Path(self.current_response.body_path).unlink(missing_ok=True)
+    
     def copy_response_headers(self):
-        headers_text = ""
-        for row in range(self.response_headers_table.rowCount()):
-            key = self.response_headers_table.item(row, 0)
-            value = self.response_headers_table.item(row, 1)
-            if key and value:
-                headers_text += f"{key.text()}: {value.text()}\n"
-        clipboard = QClipboard()
-        clipboard.setText(headers_text)
+        headers_text = "".join(f"{key}: {value}\n" for key, value in self.response_headers_model.rows)
+        self.clipboard.setText(headers_text)
         self.status_bar.showMessage("Response headers copied to clipboard")
     
     def show_settings(self):
+        from .ui_settings import SettingsDialog
         dialog = SettingsDialog(self.settings, self)
         if dialog.exec() == QDialog.DialogCode.Accepted and dialog.result_settings:
             self.settings = dialog.result_settings
-            from .persistence import save_settings
+            self.request_pool.setMaxThreadCount(max(1, self.settings.max_concurrent_requests))
             save_settings(self.settings)
             self.status_bar.showMessage("Settings saved")
     
@@ -1194,7 +1759,6 @@ class MainWindow(QMainWindow):
             QMessageBox.information(self, "No Collections", "Please create a collection first.")
             return
         
-        from PySide6.QtWidgets import QInputDialog
         collection_names = [c.name for c in collections]
         collection_name, ok = QInputDialog.getItem(
             self, "Save to Collection", "Select collection:", collection_names, 0, False
@@ -1207,8 +1771,7 @@ class MainWindow(QMainWindow):
                 if not request_name:
                     request_name = f"{request.method.value} {request.url[:30]}"
                 self.collections_widget.add_request_to_collection(collection_name, request, request_name)
-                from .persistence import save_collections
-                save_collections(self.collections_widget.get_all_collections())
+                self.save_collections_when_loaded()
                 self.status_bar.showMessage(f"Request saved to '{collection_name}'")
     
     def export_collections(self):
@@ -1222,9 +1785,7 @@ class MainWindow(QMainWindow):
         )
         if file_path:
             try:
-                data = [coll.to_dict() for coll in collections]
-                with open(file_path, "w", encoding="utf-8") as f:
-                    json.dump(data, f, indent=2)
+                write_collections_file(Path(file_path), collections)
                 self.status_bar.showMessage(f"Collections exported to {file_path}")
             except Exception as e:
                 QMessageBox.critical(self, "Export Error", f"Failed to export collections:\n{str(e)}")
@@ -1235,10 +1796,7 @@ class MainWindow(QMainWindow):
         )
         if file_path:
             try:
-                with open(file_path, "r", encoding="utf-8") as f:
-                    data = json.load(f)
-                from .models import Collection
-                collections = [Collection.from_dict(coll) for coll in data]
+                collections = read_collections_file(Path(file_path))
                 #merge with existing
                 existing = self.collections_widget.get_all_collections()
                 existing_names = {c.name for c in existing}
@@ -1246,8 +1804,7 @@ class MainWindow(QMainWindow):
                     if coll.name not in existing_names:
                         existing.append(coll)
                 self.collections_widget.load_collections(existing)
-                from .persistence import save_collections
-                save_collections(existing)
+                self.save_collections_when_loaded()
                 self.status_bar.showMessage(f"Collections imported from {file_path}")
             except Exception as e:
                 QMessageBox.critical(self, "Import Error", f"Failed to import collections:\n{str(e)}")
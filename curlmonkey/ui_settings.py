@@ -46,6 +46,10 @@ class SettingsDialog(QDialog):
         self.https_proxy_edit.setPlaceholderText("https://proxy.example.com:8080")
         network_layout.addRow("HTTPS Proxy:", self.https_proxy_edit)
         
+        self.max_concurrent_spin = QSpinBox()
+        self.max_concurrent_spin.setRange(1, 32)
+        network_layout.addRow("Concurrent Requests:", self.max_concurrent_spin)
+        
         network_group.setLayout(network_layout)
         layout.addWidget(network_group)
         
@@ -60,6 +64,26 @@ class SettingsDialog(QDialog):
         env_group.setLayout(env_layout)
         layout.addWidget(env_group)
         
+        #display settings
+        
+        display_group = QGroupBox("Display")
+        display_layout = QFormLayout()
+        
+        self.max_highlight_spin = QSpinBox()
+        self.max_highlight_spin.setRange(0, 1024 * 1024)
+        self.max_highlight_spin.setSuffix(" KB")
+        self.max_highlight_spin.setSpecialValueText("Off")
+        display_layout.addRow("Highlight JSON up to:", self.max_highlight_spin)
+        
+        self.max_pretty_spin = QSpinBox()
+        self.max_pretty_spin.setRange(0, 1024 * 1024)
+        self.max_pretty_spin.setSuffix(" KB")
+        self.max_pretty_spin.setSpecialValueText("Off")
+        display_layout.addRow("Pretty-print JSON up to:", self.max_pretty_spin)
+        
+        display_group.setLayout(display_layout)
+        layout.addWidget(display_group)
+        
         #buttons
         
         button_layout = QHBoxLayout()
@@ -81,6 +105,9 @@ class SettingsDialog(QDialog):
         self.http_proxy_edit.setText(self.settings.http_proxy)
         self.https_proxy_edit.setText(self.settings.https_proxy)
         self.default_env_edit.setText(self.settings.default_environment)
+        self.max_highlight_spin.setValue(self.settings.max_highlight_bytes // 1024)
+        self.max_pretty_spin.setValue(self.settings.max_pretty_bytes // 1024)
+        self.max_concurrent_spin.setValue(self.settings.max_concurrent_requests)
     
     def get_settings(self) -> Settings:
         return Settings(
@@ -89,7 +116,10 @@ class SettingsDialog(QDialog):
             default_environment=self.default_env_edit.text() or "Default",
             http_proxy=self.http_proxy_edit.text(),
             https_proxy=self.https_proxy_edit.text(),
-            theme="dark"
+            theme="dark",
+            max_highlight_bytes=self.max_highlight_spin.value() * 1024,
+            max_pretty_bytes=self.max_pretty_spin.value() * 1024,
+            max_concurrent_requests=self.max_concurrent_spin.value()
         )
     
     def accept(self):
@@ -0,0 +1,259 @@
+#tests for http_client: variable substitution, request bodies, the session cache and sending
+
+import glob
+import io
+import os
+import tempfile
+import threading
+
+import pytest
+
+from curlmonkey import http_client
+from curlmonkey.http_client import (
+    MultipartBody, RequestCancelled, SessionCache, build_body, read_response_body, send_request,
+    substitute_variables
+)
+from curlmonkey.models import BodyType, MultipartItem, RequestModel, Settings
+
+
+@pytest.mark.parametrize("text, expected", [
+    ("{{host}}/a", "example.test/a"),
+    ("{{host}}{{id}}", "example.test7"),
+    ("{{missing}}/{{id}}", "{{missing}}/7"),
+    ('{"a":{{{id}}}}', '{"a":{7}}'),
+    ('{"a":{{id}}}', '{"a":7}'),
+    ("{{{{id}}}}", "{{7}}"),
+    ("no placeholders", "no placeholders"),
+])
+def test_substitute_variables(text, expected):
+    assert substitute_variables(text, {"host": "example.test", "id": "7"}) == expected
+
+
+def test_substitute_variables_without_environment():
+    assert substitute_variables("{{id}}", {}) == "{{id}}"
+
+
+class FakeResponse:
+    """Just enough of a streamed requests.Response for read_response_body."""
+    
+    def __init__(self, data: bytes, headers=None, chunk_size: int = 1000, on_chunk=None):
+        self.data = data
+        self.headers = {"Content-Length": str(len(data))} if headers is None else headers
+        self.chunk_size = chunk_size
+        self.on_chunk = on_chunk
+    
+    def iter_content(self, chunk_size):
+        for i, start in enumerate(range(0, len(self.data), self.chunk_size)):
+            if self.on_chunk is not None:
+                self.on_chunk(i)
+            yield self.data[start:start + self.chunk_size]
+
+
+DATA = bytes(range(256)) * 100
+
+
+@pytest.fixture
+def small_preview(monkeypatch):
+    monkeypatch.setattr(http_client, "BODY_PREVIEW_BYTES", 100)
+
+
+def spilled_files():
+    return set(glob.glob(os.path.join(tempfile.gettempdir(), "curlmonkey-*.body")))
+
+
+@pytest.mark.parametrize("headers", [None, {}])
+def test_read_response_body_in_memory(headers):
+    body, path = read_response_body(FakeResponse(DATA, headers))
+    assert path is None
+    assert type(body) is bytes
+    assert body == DATA
+
+
+def test_read_response_body_short_body_is_trimmed():
+    response = FakeResponse(DATA, {"Content-Length": str(len(DATA) + 500)})
+    body, path = read_response_body(response)
+    assert path is None
+    assert body == DATA
+
+
+@pytest.mark.parametrize("headers", [None, {}])
+@pytest.mark.parametrize("spill_bytes", [10, 5000])
+def test_read_response_body_spills_to_file(small_preview, headers, spill_bytes):
+    body, path = read_response_body(FakeResponse(DATA, headers), spill_bytes=spill_bytes)
+    try:
+        assert path is not None
+        with open(path, "rb") as f:
+            assert f.read() == DATA
+        assert type(body) is bytes
+        assert body == DATA[:100]
+    finally:
+        os.unlink(path)
+
+
+def test_read_response_body_rejects_declared_size_over_limit():
+    with pytest.raises(ValueError):
+        read_response_body(FakeResponse(DATA), max_bytes=len(DATA) - 1)
+
+
+def test_read_response_body_rejects_streamed_size_over_limit():
+    with pytest.raises(ValueError):
+        read_response_body(FakeResponse(DATA, {}), max_bytes=len(DATA) - 1)
+
+
+def test_read_response_body_over_limit_removes_spill_file():
+    before = spilled_files()
+    with pytest.raises(ValueError):
+        read_response_body(FakeResponse(DATA, {}), max_bytes=len(DATA) - 1, spill_bytes=10)
+    assert spilled_files() == before
+
+
+def test_read_response_body_cancel_removes_spill_file():
+    cancel_event = threading.Event()
+    
+    def cancel_midway(i):
+        if i == 5:
+            cancel_event.set()
+    
+    before = spilled_files()
+    with pytest.raises(RequestCancelled):
+        read_response_body(FakeResponse(DATA, on_chunk=cancel_midway), cancel_event=cancel_event, spill_bytes=10)
+    assert spilled_files() == before
+
+
+@pytest.fixture
+def upload(tmp_path):
+    path = tmp_path / "upload.bin"
+    path.write_bytes(DATA)
+    return str(path)
+
+
+def read_all(body: MultipartBody, size: int) -> bytes:
+    chunks = []
+    while True:
+        chunk = body.read(size)
+        if not chunk:
+            return b"".join(chunks)
+        chunks.append(chunk)
+
+
+@pytest.mark.parametrize("size", [1, 7, 4096, -1])
+def test_multipart_body_streams_all_parts(upload, size):
+    body = MultipartBody([("text", "hello")], [("file", upload)])
+    data = read_all(body, size)
+    
+    assert len(data) == len(body)
+    assert body.tell() == len(data)
+    assert data.startswith(f"--{body.boundary}\r\n".encode())
+    assert b'Content-Disposition: form-data; name="text"\r\n\r\nhello\r\n' in data
+    assert b'name="file"; filename="upload.bin"\r\n\r\n' + DATA + b"\r\n" in data
+    assert data.endswith(f"--{body.boundary}--\r\n".encode())
+
+
+def test_multipart_body_rewinds(upload):
+    body = MultipartBody([("text", "hello")], [("file", upload)])
+    first = b"".join(body)
+    body.read(10)
+    
+    assert body.seek(0) == 0
+    assert body.tell() == 0
+    assert b"".join(body) == first
+
+
+def test_multipart_body_only_rewinds(upload):
+    body = MultipartBody([], [("file", upload)])
+    with pytest.raises(io.UnsupportedOperation):
+        body.seek(10)
+
+
+def test_multipart_body_quotes_names():
+    body = MultipartBody([('a"b\r\nc', "v")], [])
+    assert b'name="a%22b%0D%0Ac"' in b"".join(body)
+
+
+def test_build_body_without_enabled_multipart_items_sends_nothing():
+    request = RequestModel(body_type=BodyType.MULTIPART, multipart_data=[
+        MultipartItem(enabled=False, key="a", value="1"),
+        MultipartItem(key="", value="no key"),
+    ])
+    assert build_body(request, {}) == (None, None, None)
+
+
+def test_build_body_streams_enabled_multipart_items(upload):
+    request = RequestModel(body_type=BodyType.MULTIPART, multipart_data=[
+        MultipartItem(key="a", value="1"),
+        MultipartItem(key="f", type="file", value=upload),
+    ])
+    body, files, json_data = build_body(request, {})
+    assert isinstance(body, MultipartBody)
+    assert files is None and json_data is None
+    assert DATA in b"".join(body)
+
+
+def test_session_cache_keeps_the_old_session_open_on_settings_change():
+    sessions = SessionCache()
+    first = sessions.get(Settings())
+    assert sessions.get(Settings()) is first
+    
+    #stands in for the connection a running request is reading from
+    pools = first.get_adapter("http://example.test").poolmanager.pools
+    first.get_adapter("http://example.test").poolmanager.connection_from_url("http://example.test")
+    second = sessions.get(Settings(https_proxy="http://proxy.test:3128"))
+    
+    assert second is not first
+    #closing the old session would have emptied its pools under that request
+    assert len(pools) == 1
+    sessions.close()
+
+
+@pytest.fixture
+def server():
+    from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+    
+    class Handler(BaseHTTPRequestHandler):
+        requests_seen = 0
+        
+        def log_message(self, *args):
+            pass
+        
+        def do_GET(self):
+            Handler.requests_seen += 1
+            #the client gives up on the headers while they are delayed
+            if self.path == "/slow":
+                server.cancel_event.set()
+            self.send_response(200)
+            self.send_header("Content-Length", "2")
+            self.end_headers()
+            self.wfile.write(b"ok")
+    
+    server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+    server.handler = Handler
+    server.cancel_event = threading.Event()
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    yield server
+    server.shutdown()
+    server.server_close()
+
+
+def test_send_request_cancelled_before_sending(server):
+    server.cancel_event.set()
+    request = RequestModel(url=f"http://127.0.0.1:{server.server_port}/")
+    response = send_request(request, Settings(), {}, server.cancel_event, SessionCache())
+    
+    assert response.error == "Request cancelled"
+    assert server.handler.requests_seen == 0
+
+
+def test_send_request_cancelled_while_waiting_for_headers(server):
+    request = RequestModel(url=f"http://127.0.0.1:{server.server_port}/slow")
+    response = send_request(request, Settings(), {}, server.cancel_event, SessionCache())
+    
+    assert response.error == "Request cancelled"
+    assert server.handler.requests_seen == 1
+
+
+def test_send_request_reads_the_body(server):
+    request = RequestModel(url=f"http://127.0.0.1:{server.server_port}/")
+    response = send_request(request, Settings(), {}, threading.Event(), SessionCache())
+    
+    assert response.error is None
+    assert response.body_bytes == b"ok"
@@ -0,0 +1,199 @@
+#tests for the on-disk formats in persistence
+
+import json
+import threading
+from datetime import datetime
+
+import pytest
+
+from curlmonkey import persistence
+from curlmonkey.models import Collection, HistoryEntry, RequestModel
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    #every path helper points into a fresh directory
+    for getter, filename in (
+        ("get_settings_path", "settings.json"),
+        ("get_history_path", "history.jsonl"),
+        ("get_legacy_history_path", "history.json"),
+        ("get_collections_path", "collections.json"),
+        ("get_environments_path", "environments.json"),
+    ):
+        monkeypatch.setattr(persistence, getter, lambda filename=filename: tmp_path / filename)
+    monkeypatch.setattr(persistence, "_appends_since_compact", 0)
+    return tmp_path
+
+
+def make_entry(i: int) -> HistoryEntry:
+    return HistoryEntry(
+        timestamp=datetime(2024, 1, 1, 0, 0, i % 60, i),
+        method="GET",
+        url=f"https://example.test/{i}",
+        status_code=200,
+        request=RequestModel(url=f"https://example.test/{i}"),
+    )
+
+
+def history_lines(data_dir):
+    return (data_dir / "history.jsonl").read_text(encoding="utf-8").splitlines()
+
+
+def test_history_entries_are_appended_oldest_first(data_dir):
+    persistence.add_history_entries([make_entry(0), make_entry(1)])
+    persistence.add_history_entry(make_entry(2))
+    
+    assert [json.loads(line)["url"] for line in history_lines(data_dir)] == [
+        "https://example.test/0", "https://example.test/1", "https://example.test/2"
+    ]
+    #loaded newest first
+    assert [entry.url for entry in persistence.load_history()] == [
+        "https://example.test/2", "https://example.test/1", "https://example.test/0"
+    ]
+
+
+def test_load_history_reads_only_the_tail(data_dir, monkeypatch):
+    monkeypatch.setattr(persistence, "MAX_HISTORY_ENTRIES", 5)
+    (data_dir / "history.jsonl").write_text(
+        "".join(json.dumps(make_entry(i).to_dict()) + "\n" for i in range(12)), encoding="utf-8"
+    )
+    
+    assert [entry.url for entry in persistence.load_history()] == [
+        f"https://example.test/{i}" for i in range(11, 6, -1)
+    ]
+
+
+def test_load_history_skips_unreadable_lines(data_dir):
+    good = json.dumps(make_entry(1).to_dict())
+    (data_dir / "history.jsonl").write_text(f"{good}\n\n{{torn", encoding="utf-8")
+    
+    assert [entry.url for entry in persistence.load_history()] == ["https://example.test/1"]
+
+
+def test_loaded_history_keeps_the_request(data_dir):
+    persistence.add_history_entry(make_entry(3))
+    (entry,) = persistence.load_history()
+    
+    assert entry.request.url == "https://example.test/3"
+    assert entry.to_dict() == make_entry(3).to_dict()
+
+
+def test_save_history_writes_newest_last(data_dir):
+    persistence.save_history([make_entry(2), make_entry(1)])
+    
+    assert [json.loads(line)["url"] for line in history_lines(data_dir)] == [
+        "https://example.test/1", "https://example.test/2"
+    ]
+
+
+def test_history_is_compacted_every_hundred_appends(data_dir, monkeypatch):
+    monkeypatch.setattr(persistence, "MAX_HISTORY_ENTRIES", 30)
+    
+    for i in range(persistence._COMPACT_EVERY - 1):
+        persistence.add_history_entry(make_entry(i))
+    assert len(history_lines(data_dir)) == persistence._COMPACT_EVERY - 1
+    
+    persistence.add_history_entry(make_entry(persistence._COMPACT_EVERY - 1))
+    lines = history_lines(data_dir)
+    assert len(lines) == 30
+    assert json.loads(lines[-1])["url"] == f"https://example.test/{persistence._COMPACT_EVERY - 1}"
+    assert persistence._appends_since_compact == 0
+
+
+def test_legacy_history_is_migrated(data_dir):
+    #the old format was one json array, newest first
+    legacy = [make_entry(2).to_dict(), make_entry(1).to_dict()]
+    (data_dir / "history.json").write_text(json.dumps(legacy), encoding="utf-8")
+    
+    assert [entry.url for entry in persistence.load_history()] == [
+        "https://example.test/2", "https://example.test/1"
+    ]
+    assert not (data_dir / "history.json").exists()
+    assert [json.loads(line)["url"] for line in history_lines(data_dir)] == [
+        "https://example.test/1", "https://example.test/2"
+    ]
+
+
+def test_legacy_history_is_migrated_before_an_append(data_dir):
+    (data_dir / "history.json").write_text(json.dumps([make_entry(1).to_dict()]), encoding="utf-8")
+    persistence.add_history_entry(make_entry(2))
+    
+    assert [entry.url for entry in persistence.load_history()] == [
+        "https://example.test/2", "https://example.test/1"
+    ]
+    assert not (data_dir / "history.json").exists()
+
+
+@pytest.mark.parametrize("timestamp", ["", None, "not a date", 12])
+def test_history_entry_from_dict_falls_back_to_now(timestamp):
+    before = datetime.now()
+    entry = HistoryEntry.from_dict({"timestamp": timestamp, "method": "POST", "url": "https://example.test/x"})
+    
+    assert before <= entry.timestamp <= datetime.now()
+    assert entry.method == "POST"
+    assert entry.request is None
+
+
+def test_history_entry_from_dict_defaults():
+    entry = HistoryEntry.from_dict({})
+    
+    assert entry.method == "GET"
+    assert entry.url == ""
+    assert entry.status_code is None
+
+
+def test_concurrent_saves_of_one_file_leave_a_whole_file(data_dir):
+    collections = [[Collection(name=f"{writer}-{i}") for i in range(50)] for writer in range(4)]
+    
+    def save_repeatedly(writer):
+        for _ in range(25):
+            persistence.save_collections(collections[writer])
+    
+    threads = [threading.Thread(target=save_repeatedly, args=(writer,)) for writer in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    names = [coll.name for coll in persistence.load_collections()]
+    assert names in [[coll.name for coll in written] for written in collections]
+    assert not list(data_dir.glob("*.tmp"))
+
+
+def test_concurrent_history_appends_are_all_kept(data_dir, monkeypatch):
+    monkeypatch.setattr(persistence, "MAX_HISTORY_ENTRIES", 10000)
+    
+    def append_repeatedly(writer):
+        for i in range(60):
+            persistence.add_history_entry(make_entry(writer * 1000 + i))
+    
+    threads = [threading.Thread(target=append_repeatedly, args=(writer,)) for writer in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    
+    #compaction ran in between and must not have dropped an append
+    assert len(persistence.load_history()) == 240
+
+
+def test_failed_atomic_write_keeps_the_old_file(data_dir):
+    path = data_dir / "collections.json"
+    persistence.save_collections([Collection(name="kept")])
+    
+    with pytest.raises(AttributeError):
+        persistence._write_text_atomic(path, None)
+    
+    assert [coll.name for coll in persistence.load_collections()] == ["kept"]
+    assert not list(data_dir.glob("*.tmp"))
+
+
+@pytest.mark.parametrize("url, name", [
+    ("https://example.test/a/b?q=1#f", "GET example.test/a/b"),
+    ("https://example.test/a;params?q=1", "GET example.test/a"),
+    ("localhost:8080/x", "GET 8080/x"),
+    ("example.test/path", "GET example.test/path"),
+    ("https://example.test/" + "p" * 50, "GET example.test/" + "p" * 29),
+])
+def test_history_entry_label_matches_urlparse(url, name):
+    assert HistoryEntry(timestamp=datetime.now(), method="GET", url=url).name == name